@@ -1,17 +1,502 @@
 #!/usr/bin/env python3
 
+import io
 import os
+import hashlib
 import sys
 import json
+import time
+import signal
+import socket
+import queue
+import threading
+import statistics
+import socketserver
+import tempfile
 import subprocess
+import multiprocessing
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, asdict, replace
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 import argparse
 
+from test_solution import SolutionTester, CPP_COMPILER, CPP_FLAGS
+from compile_cache import CompileCache, PrecompiledHeader, compiler_version
+
+# Fixed CPU-bound workload timed before each problem to measure contention
+CALIBRATION_LOOPS = 300_000
+# Slowdown under load above which batch TLE verdicts are flagged as unreliable
+CONTENTION_WARNING = 0.10
+
+# Files whose contents decide a problem's verdict; any change invalidates its manifest entry
+FINGERPRINT_FILES = [
+    "solution.cpp", "solution.py", "Solution.java", "test_cases.json", "metadata.json",
+    "sample_input.txt", "sample_output.txt", "input.txt", "expected.txt",
+    "interactor.cpp", "interactor.py"
+]
+MANIFEST_VERSION = 2
+
+# Generators for differential max tests, called as `gen <n> <seed>` like benchmark.py
+GENERATOR_FILES = ["gen.py", "gen.cpp", "generator.py", "generator.cpp"]
+
+DEFAULT_QUEUE_PORT = 7878
+# Seconds the coordinator waits, once finished, for workers to get their "no more work" reply
+WORKER_GOODBYE_TIMEOUT = 5.0
+
+# Longest text kept per field (expected/actual output, stderr, ...) in logged results
+EXCERPT_LIMIT = 1024
+EXCERPT_FIELDS = ("expected", "actual", "output", "error")
+
+# Set in each worker process by init_worker
+_worker_cpu = None
+
+def available_cpus():
+    """CPUs this process may run on (respects taskset/cgroup affinity)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def init_worker(cpus, next_slot):
+    """Pin this worker (and every solution it starts) to a core no other worker uses"""
+    global _worker_cpu
+    # Ctrl-C is handled by the parent, which lets running problems finish
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    with next_slot.get_lock():
+        slot = next_slot.value
+        next_slot.value += 1
+    if slot >= len(cpus) or not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        os.sched_setaffinity(0, {cpus[slot]})
+        _worker_cpu = cpus[slot]
+    except OSError:
+        pass
+
+def toolchain_fingerprint():
+    """Compiler and runtime identities plus flags, shared by every problem's fingerprint"""
+    versions = [compiler_version(tool) for tool in (CPP_COMPILER, 'python3', 'javac', 'java')]
+    return '\0'.join(versions + [' '.join(CPP_FLAGS)])
+
+def problem_fingerprint(problem_dir, toolchain):
+    """SHA-256 over the toolchain and the name and contents of every verdict-relevant file"""
+    digest = hashlib.sha256(toolchain.encode())
+    for name in FINGERPRINT_FILES:
+        path = Path(problem_dir) / name
+        if path.is_file():
+            digest.update(b'\0' + name.encode() + b'\0')
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def init_compiler_thread(cpus):
+    """Keep a compile-stage thread (and the g++ it starts) off the run stage's cores"""
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+
+def precompile_problem(problem_dir, compile_cache, pch):
+    """
+    Compile stage: build a problem's C++ programs into the compile cache, so the
+    run stage's own compile step is a cache hit. Returns (problem_dir, built, failed).
+    """
+    built = failed = 0
+    for name in ("solution.cpp", "interactor.cpp"):
+        source = Path(problem_dir) / name
+        if not source.exists():
+            continue
+        ok, cache_hit, _ = compile_cache.compile(
+            source, source.with_suffix(''), CPP_COMPILER, CPP_FLAGS, extra_flags=lambda: pch.flags_for(source)
+        )
+        built += ok and not cache_hit
+        failed += not ok
+    return problem_dir, built, failed
+
+def calibrate():
+    """Wall time of a fixed busy loop; grows when the core is shared"""
+    start_time = time.perf_counter()
+    total = 0
+    for i in range(CALIBRATION_LOOPS):
+        total += i * i
+    return time.perf_counter() - start_time
+
+def contention_report(baseline, loaded):
+    """Compare calibration times measured alone with those measured during the batch"""
+    loaded = [t for t in loaded if t is not None]
+    if not baseline or not loaded:
+        return None
+    base = statistics.median(baseline)
+    under_load = statistics.median(loaded)
+    return {
+        "baseline_s": base,
+        "loaded_s": under_load,
+        "slowdown": under_load / base - 1,
+        "baseline_cv": statistics.pstdev(baseline) / statistics.mean(baseline),
+        "loaded_cv": statistics.pstdev(loaded) / statistics.mean(loaded)
+    }
+
+@dataclass
+class ProblemResult:
+    """Outcome of testing one problem; cases are SolutionTester's per-case result dicts"""
+    problem: str
+    success: bool
+    cases: list = field(default_factory=list)
+    compile_errors: list = field(default_factory=list)
+    duration: float = 0.0
+    error: str = None
+    cpu: int = None
+    calibration: float = None
+    # Nothing executed: reused from the manifest, or every case judged from the run cache.
+    # The duration of such a result says nothing about the problem's real cost.
+    cached: bool = False
+    verdicts: dict = None
+    
+    def __post_init__(self):
+        # Count of each verdict, kept so summaries survive dropping the cases
+        if self.verdicts is None:
+            self.verdicts = {}
+            for case in self.cases:
+                self.verdicts[case["status"]] = self.verdicts.get(case["status"], 0) + 1
+    
+    def summary(self):
+        """Copy without per-case details, cheap to keep for every problem of a huge run"""
+        return replace(self, cases=[])
+    
+    def to_dict(self):
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data):
+        fields = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**fields)
+
+def excerpt(text, limit=EXCERPT_LIMIT):
+    if not isinstance(text, str) or len(text) <= limit:
+        return text
+    return text[:limit] + "\n... (truncated)"
+
+def trim_case(case):
+    """Case result with its long text fields cut to EXCERPT_LIMIT"""
+    return {k: excerpt(v) if k in EXCERPT_FIELDS else v for k, v in case.items()}
+
+def run_problem(problem_dir, platforms_dir, max_workers=None):
+    """
+    Drive SolutionTester directly (no python3 subprocess, no output scraping).
+    The tester's console output is discarded; its structured results are kept.
+    Module level so it can run in pooled worker processes.
+    """
+    problem = str(Path(problem_dir).relative_to(platforms_dir))
+    calibration = calibrate()
+    start_time = time.perf_counter()
+    try:
+        with redirect_stdout(io.StringIO()):
+            tester = SolutionTester(problem_dir, max_workers=max_workers)
+            cases = tester.test_all_solutions()
+    except Exception as e:
+        return ProblemResult(problem, False, error=str(e), duration=time.perf_counter() - start_time,
+                             cpu=_worker_cpu, calibration=calibration)
+    
+    judged = [c for c in cases if c["status"] != "Output Generated"]
+    success = (
+        bool(judged)
+        and not tester.compile_errors
+        and all(c["status"] == "Accepted" for c in judged)
+    )
+    cached = bool(cases) and not tester.compile_errors and all(c.get("cached") for c in cases)
+    error = None
+    if tester.compile_errors:
+        error = f"Compilation failed: {', '.join(tester.compile_errors)}"
+    elif not cases:
+        error = "No solutions or test cases found"
+    return ProblemResult(
+        problem, success, cases=[trim_case(c) for c in cases], compile_errors=tester.compile_errors,
+        duration=time.perf_counter() - start_time, error=error,
+        cpu=_worker_cpu, calibration=calibration, cached=cached
+    )
+
+@dataclass
+class DifferentialResult:
+    """All language implementations of one problem run on the same inputs"""
+    problem: str
+    languages: list = field(default_factory=list)
+    inputs: int = 0
+    disagreements: list = field(default_factory=list)
+    failures: list = field(default_factory=list)
+    times: dict = field(default_factory=dict)
+    max_times: dict = field(default_factory=dict)
+    time_limit: float = None
+    speed_ratio: float = None
+    at_risk: bool = False
+    error: str = None
+    
+    def to_dict(self):
+        return asdict(self)
+
+def find_generator(tester):
+    if tester.metadata.get("generator"):
+        return tester.metadata["generator"]
+    return next((name for name in GENERATOR_FILES if (tester.problem_dir / name).exists()), None)
+
+def run_differential(problem_dir, platforms_dir, max_tests=2):
+    """
+    Run every language's solution on the stored tests plus generated max tests,
+    compare each output with the C++ one (or the first language's) and time them.
+    """
+    result = DifferentialResult(str(Path(problem_dir).relative_to(platforms_dir)))
+    try:
+        with redirect_stdout(io.StringIO()), tempfile.TemporaryDirectory(prefix="cp-diff-") as tmp:
+            tmp = Path(tmp)
+            # Cold start for every language: Python timings must match a judge's
+            tester = SolutionTester(problem_dir, cold_start=True, max_workers=1)
+            tester.load_metadata()
+            result.time_limit = tester.time_limit
+            if tester.metadata.get("interactive"):
+                result.error = "Interactive problem, no output to compare"
+                return result
+            
+            commands = {}
+            for lang, source in tester.find_solution_files().items():
+                executable = source
+                if lang == 'cpp':
+                    executable = tester.compile_cpp(source)
+                elif lang == 'java':
+                    executable = tester.compile_java(source)
+                if executable:
+                    commands[lang] = tester.build_command(executable, lang)
+                else:
+                    result.failures.append({"lang": lang, "input": None, "reason": "compilation failed"})
+            result.languages = list(commands)
+            if len(commands) < 2:
+                result.error = "Fewer than two languages to compare"
+                return result
+            
+            inputs = []
+            for case in tester.load_test_cases():
+                if case.get("input_file"):
+                    inputs.append((case["name"], case["input_file"]))
+                else:
+                    path = tmp / f"case-{case['id']}.txt"
+                    path.write_text(case.get("input", ""))
+                    inputs.append((case["name"], path))
+            
+            generator = find_generator(tester)
+            max_n = tester.metadata.get("max_n")
+            if generator and max_n:
+                gen_command = tester.prepare_program(generator, "generator")
+                for seed in range(1, max_tests + 1):
+                    path = tmp / f"max-{seed}.txt"
+                    with open(path, 'w') as f:
+                        gen = subprocess.run(gen_command + [str(max_n), str(seed)], stdout=f,
+                                             stderr=subprocess.PIPE, text=True)
+                    if gen.returncode != 0:
+                        result.failures.append({"lang": "generator", "input": f"max test {seed}",
+                                                "reason": gen.stderr.strip()[-500:]})
+                        break
+                    inputs.append((f"Max test {seed} (n = {max_n})", path))
+            result.inputs = len(inputs)
+            
+            reference = 'cpp' if 'cpp' in commands else result.languages[0]
+            totals = {lang: 0.0 for lang in commands}
+            for name, input_file in inputs:
+                outputs = {}
+                for lang, command in commands.items():
+                    output_path = tmp / f"out-{lang}.txt"
+                    run = tester.execute(command, input_file=input_file, output_path=output_path)
+                    result.max_times[lang] = max(result.max_times.get(lang, 0.0), run["cpu_time"])
+                    totals[lang] += run["cpu_time"]
+                    if run["timed_out"]:
+                        result.failures.append({"lang": lang, "input": name, "reason": "timeout"})
+                    elif run["returncode"] != 0:
+                        result.failures.append({"lang": lang, "input": name,
+                                                "reason": excerpt(run["stderr"].strip()) or f"exit code {run['returncode']}"})
+                    else:
+                        outputs[lang] = output_path
+                
+                if reference not in outputs:
+                    continue
+                for lang, output_path in outputs.items():
+                    if lang == reference:
+                        continue
+                    ok, message = tester.checker.check(output_path, outputs[reference])
+                    if not ok:
+                        result.disagreements.append({"input": name, "lang": lang, "reference": reference,
+                                                     "mismatch": message})
+            
+            result.times = totals
+            if totals.get('cpp') and 'python' in totals:
+                result.speed_ratio = totals['python'] / totals['cpp']
+            result.at_risk = any(
+                t > tester.time_limit for lang, t in result.max_times.items() if lang != 'cpp'
+            ) or any(f["reason"] == "timeout" for f in result.failures)
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+def parse_shard(text):
+    """'2/4' -> (2, 4); shards are numbered from 1"""
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/n, got {text!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}")
+    return index, count
+
+def in_shard(name, index, count):
+    """Stable partition: the same problem lands in the same shard on every machine"""
+    return int(hashlib.sha256(name.encode()).hexdigest(), 16) % count == index - 1
+
+class ResultsLog:
+    """
+    JSON Lines log with one ProblemResult per line, flushed as each problem finishes,
+    so an interrupted run loses nothing and can be resumed.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = None
+    
+    def __iter__(self):
+        """Result dicts in the log; a line cut short by a crash is skipped"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    
+    def read(self):
+        """problem -> summary of every result already logged"""
+        return {data["problem"]: ProblemResult.from_dict(data).summary() for data in self}
+    
+    def open(self, resume=False):
+        if resume and self.path.exists() and self.path.stat().st_size:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                complete = f.read(1) == b'\n'
+            self.file = open(self.path, 'a')
+            if not complete:
+                self.file.write("\n")
+        else:
+            self.file = open(self.path, 'w')
+    
+    def append(self, result):
+        self.file.write(json.dumps(result.to_dict()) + "\n")
+        self.file.flush()
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+class WorkQueue:
+    """Problems handed out by the coordinator; problems held by a dropped worker are re-queued"""
+    
+    def __init__(self, problems, on_result=None):
+        self.pending = deque(problems)
+        self.in_flight = set()
+        self.results = {}
+        self.on_result = on_result
+        self.lock = threading.Lock()
+        # Signalled when work is re-queued, the queue finishes or a worker disconnects
+        self.changed = threading.Condition(self.lock)
+        self.connections = 0
+        self.done = threading.Event()
+        if not self.pending:
+            self.done.set()
+    
+    def next_problem(self):
+        """A problem name, or None when finished; blocks while the rest is in flight, since it may be re-queued"""
+        with self.changed:
+            while not self.pending and self.in_flight:
+                self.changed.wait()
+            if self.pending:
+                problem = self.pending.popleft()
+                self.in_flight.add(problem)
+                return problem
+            return None
+    
+    def complete(self, result):
+        with self.changed:
+            if result.problem in self.results:
+                return
+            # Still in flight while recording: if on_result raises, the handler re-queues it
+            if self.on_result:
+                self.on_result(result)
+            self.in_flight.discard(result.problem)
+            if result.problem in self.pending:
+                # Re-queued after a disconnect but finished anyway
+                self.pending.remove(result.problem)
+            self.results[result.problem] = result.summary()
+            if not self.pending and not self.in_flight:
+                self.done.set()
+                self.changed.notify_all()
+        status = "✅" if result.success else "❌"
+        print(f"{status} {result.problem} ({result.duration:.2f}s, {len(self.results)} done)")
+    
+    def requeue(self, problem):
+        with self.changed:
+            if problem not in self.in_flight:
+                return
+            self.in_flight.discard(problem)
+            self.pending.appendleft(problem)
+            self.changed.notify_all()
+        print(f"🔁 Worker dropped {problem}, re-queued")
+    
+    def connect(self):
+        with self.changed:
+            self.connections += 1
+    
+    def disconnect(self):
+        with self.changed:
+            self.connections -= 1
+            self.changed.notify_all()
+    
+    def wait_for_workers(self, timeout):
+        """Give connected workers up to timeout seconds to receive their "no more work" reply"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.connections == 0, timeout)
+
+class QueueHandler(socketserver.StreamRequestHandler):
+    """
+    One worker connection, one JSON object per line:
+        worker -> {"result": <ProblemResult dict or null>}
+        coordinator -> {"problem": name} | {"problem": null} (no more work)
+    While the last problems are in flight the coordinator holds its reply, since a
+    dropped worker's problem may still be re-queued.
+    """
+    
+    def handle(self):
+        queue = self.server.work_queue
+        queue.connect()
+        assigned = None
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message.get("result"):
+                    queue.complete(ProblemResult.from_dict(message["result"]))
+                    assigned = None
+                problem = queue.next_problem()
+                assigned = problem
+                self.wfile.write((json.dumps({"problem": problem}) + "\n").encode())
+                if problem is None:
+                    break
+        except (OSError, ValueError):
+            pass
+        finally:
+            if assigned is not None:
+                queue.requeue(assigned)
+            queue.disconnect()
+
 class BatchOperations:
     def __init__(self):
-        self.root_dir = Path(__file__).parent.parent
-        self.platforms_dir = self.root_dir / "platforms"
+        self.root_dir = Path(__file__).resolve().parent.parent
+        self.platforms_dir = self.root_dir / "platform"
+        self.manifest_file = self.root_dir / "batch_manifest.json"
+        # Full per-case results behind the manifest's summaries, one file per problem
+        self.manifest_dir = self.root_dir / "batch_manifest.d"
     
     def find_all_problems(self, platform=None):
         """Find all problem directories"""
@@ -38,115 +523,581 @@ class BatchOperations:
         
         return sorted(problems)
     
-    def test_problem(self, problem_dir):
-        """Test a single problem and return results"""
+    def test_problem(self, problem_dir, max_workers=None):
+        """Test a single problem in this process and return a ProblemResult"""
+        return run_problem(problem_dir, self.platforms_dir, max_workers)
+    
+    def load_manifest(self):
+        """problem -> {"hash", "result": summary without cases} from the last batch runs"""
+        if not self.manifest_file.exists():
+            return {}
         try:
-            result = subprocess.run([
-                "python3", 
-                str(self.root_dir / "scripts" / "test_solution.py"),
-                str(problem_dir)
-            ], capture_output=True, text=True, timeout=30)
-            
-            # Extract results from output
-            success = "All tests passed!" in result.stdout
-            return {
-                "problem": str(problem_dir.relative_to(self.platforms_dir)),
-                "success": success,
-                "output": result.stdout,
-                "error": result.stderr if result.returncode != 0 else None
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                "problem": str(problem_dir.relative_to(self.platforms_dir)),
-                "success": False,
-                "error": "Timeout"
-            }
+            with open(self.manifest_file, 'r') as f:
+                data = json.load(f)
         except Exception as e:
-            return {
-                "problem": str(problem_dir.relative_to(self.platforms_dir)),
-                "success": False,
-                "error": str(e)
-            }
-    
-    def batch_test(self, platform=None, parallel=True, max_workers=4):
-        """Test multiple problems"""
+            print(f"⚠️  Could not read {self.manifest_file.name}, re-testing everything: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("problems", {})
+    
+    def save_manifest(self, manifest):
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({"version": MANIFEST_VERSION, "problems": manifest}, f, indent=1)
+        os.replace(tmp_file, self.manifest_file)
+    
+    def manifest_entry_path(self, problem):
+        return self.manifest_dir / f"{problem}.json"
+    
+    def store_manifest_result(self, result):
+        """Write a problem's full result next to the manifest (atomically)"""
+        entry = self.manifest_entry_path(result.problem)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_entry, 'w') as f:
+            json.dump(result.to_dict(), f)
+        os.replace(tmp_entry, entry)
+    
+    def manifest_result(self, summary):
+        """Full result for a reused manifest summary, read from disk (the summary if it's gone)"""
+        try:
+            with open(self.manifest_entry_path(summary.problem), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return summary
+        return ProblemResult.from_dict(dict(data, cached=True))
+    
+    def load_durations(self, manifest, results_file=None):
+        """
+        Per-problem durations from earlier batch results, else the manifest. Reads the
+        default batch_test_results.json, every shard file and results_file (the file this
+        run writes); where they overlap, the most recently written file wins.
+        """
+        durations = {
+            name: entry["result"]["duration"]
+            for name, entry in manifest.items()
+            if entry.get("result", {}).get("duration") and not entry["result"].get("cached")
+        }
+        candidates = {self.root_dir / "batch_test_results.json"}
+        candidates.update(self.root_dir.glob("batch_test_results.shard-*.json"))
+        if results_file:
+            candidates.add(Path(results_file))
+        previous_files = []
+        for path in candidates:
+            try:
+                previous_files.append((path.stat().st_mtime_ns, str(path), path))
+            except OSError:
+                continue
+        
+        for _, _, path in sorted(previous_files):
+            try:
+                with open(path, 'r') as f:
+                    previous = json.load(f)
+                for result in previous.get("results", []):
+                    if result.get("duration") and not result.get("cached"):
+                        durations[result["problem"]] = result["duration"]
+            except Exception as e:
+                print(f"⚠️  Could not read previous batch results {path.name}: {e}")
+        return durations
+    
+    def schedule(self, problems, durations):
+        """
+        Longest-processing-time-first order. Problems without history are assumed
+        to take the median known duration. Returns (ordered problems, estimates).
+        """
+        names = {p: str(p.relative_to(self.platforms_dir)) for p in problems}
+        known = [durations[n] for n in names.values() if n in durations]
+        default = statistics.median(known) if known else 1.0
+        estimates = {p: durations.get(names[p], default) for p in problems}
+        ordered = sorted(problems, key=lambda p: (-estimates[p], names[p]))
+        return ordered, estimates
+    
+    def result_recorder(self, manifest, fingerprints, log, results):
+        """
+        Callback that logs a fresh result and keeps only its summary in memory; the full
+        result goes to disk under manifest_dir, and the manifest entry holds the summary.
+        """
+        hashes = {str(p.relative_to(self.platforms_dir)): h for p, h in fingerprints.items()}
+        def record(result):
+            log.append(result)
+            summary = result.summary()
+            # Runs that never got as far as testing aren't reusable
+            if result.cases or result.compile_errors:
+                self.store_manifest_result(result)
+                manifest[result.problem] = {"hash": hashes[result.problem], "result": summary.to_dict()}
+            results.append(summary)
+        return record
+    
+    def select_problems(self, problems, manifest, fingerprints, changed_only, done):
+        """Split problems into (to test, reusable manifest results), skipping those already logged"""
+        stale = []
+        cached_results = []
+        for problem in problems:
+            name = str(problem.relative_to(self.platforms_dir))
+            if name in done:
+                continue
+            entry = manifest.get(name)
+            if changed_only and entry and entry.get("hash") == fingerprints[problem]:
+                cached_results.append(ProblemResult.from_dict(dict(entry["result"], cached=True)))
+            else:
+                stale.append(problem)
+        if done:
+            print(f"⏩ Resuming: {len(done)} problems already logged")
+        if changed_only:
+            print(f"♻️  {len(cached_results)} unchanged problems reported from {self.manifest_file.name}")
+        return stale, cached_results
+    
+    def batch_test(self, platform=None, parallel=True, max_workers=None, pin_cpus=True, changed_only=False,
+                   shard=None, results_file=None, resume=False):
+        """
+        Test multiple problems, appending each result to a JSON Lines log as it finishes.
+        With changed_only, unchanged problems are reported from the manifest; with resume,
+        problems already in the log are skipped.
+        """
         problems = self.find_all_problems(platform)
         
         if not problems:
             print("❌ No problems found!")
             return
         
+        if shard:
+            index, count = shard
+            problems = [p for p in problems if in_shard(str(p.relative_to(self.platforms_dir)), index, count)]
+            print(f"🧩 Shard {index}/{count}: {len(problems)} problems")
+        
+        results_file = Path(results_file) if results_file else self.root_dir / "batch_test_results.json"
+        log = ResultsLog(results_file.with_suffix('.jsonl'))
+        done = log.read() if resume else {}
+        
+        manifest = self.load_manifest()
+        toolchain = toolchain_fingerprint()
+        fingerprints = {p: problem_fingerprint(p, toolchain) for p in problems}
+        problems, cached_results = self.select_problems(problems, manifest, fingerprints, changed_only, done)
+        
         print(f"🧪 Found {len(problems)} problems to test...")
         
-        if parallel:
-            print(f"🚀 Running tests in parallel with {max_workers} workers...")
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_problem = {
-                    executor.submit(self.test_problem, problem): problem 
-                    for problem in problems
-                }
-                
-                results = []
-                for future in as_completed(future_to_problem):
-                    result = future.result()
-                    results.append(result)
+        problems, estimates = self.schedule(problems, self.load_durations(manifest, results_file))
+        schedule = None
+        
+        log.open(resume)
+        for result in cached_results:
+            log.append(self.manifest_result(result))
+        results = []
+        record = self.result_recorder(manifest, fingerprints, log, results)
+        
+        # Calibration timings taken alone, to compare with those taken under load
+        baseline = [calibrate() for _ in range(5)] if problems else []
+        
+        try:
+            if problems and parallel:
+                schedule = self.run_pool(problems, record, max_workers, pin_cpus, estimates)
+            elif problems:
+                for i, problem in enumerate(problems, 1):
+                    print(f"🧪 Testing {i}/{len(problems)}: {problem.relative_to(self.platforms_dir)}")
+                    result = self.test_problem(problem)
+                    record(result)
                     
-                    # Print progress
-                    status = "✅" if result["success"] else "❌"
-                    print(f"{status} {result['problem']}")
-        else:
-            results = []
-            for i, problem in enumerate(problems, 1):
-                print(f"🧪 Testing {i}/{len(problems)}: {problem.relative_to(self.platforms_dir)}")
-                result = self.test_problem(problem)
-                results.append(result)
-                
-                status = "✅" if result["success"] else "❌"
-                print(f"{status} Done")
+                    status = "✅" if result.success else "❌"
+                    print(f"{status} Done ({result.duration:.2f}s)")
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Interrupted after {len(results)} problems; continue with --resume")
+        finally:
+            log.close()
+            self.save_manifest(manifest)
+        
+        # Fully cached problems hardly ran, so their calibration says little about contention
+        contention = contention_report(baseline, [r.calibration for r in results if not r.cached])
+        
+        results = sorted(
+            list(done.values()) + [r.summary() for r in cached_results] + results,
+            key=lambda r: r.problem
+        )
         
         # Print summary
-        self.print_test_summary(results)
+        self.print_test_summary(results, contention, schedule)
         
         # Save detailed results
-        self.save_batch_results(results)
+        self.save_batch_results(results, contention, schedule, results_file, log=log)
+        return results
     
-    def print_test_summary(self, results):
+    def run_pool(self, problems, record, max_workers, pin_cpus, estimates):
+        """
+        Two-stage pipeline. A thread pool compiles binaries into the compile cache on
+        the CPUs the run stage doesn't use. Whenever a run worker is free it gets the
+        ready problem with the longest estimate. Returns schedule statistics.
+        """
+        # Each problem runs its cases one at a time so a pinned worker never shares
+        # its core with another solution; by default half the CPUs run, half compile
+        cpus = available_cpus()
+        pin_cpus = pin_cpus and hasattr(os, 'sched_setaffinity')
+        if max_workers is None:
+            max_workers = max(1, len(cpus) // 2)
+        elif pin_cpus and max_workers > len(cpus):
+            print(f"⚠️  Only {len(cpus)} CPUs available, using {len(cpus)} pinned workers")
+            max_workers = len(cpus)
+        
+        pinned = cpus[:max_workers] if pin_cpus else []
+        compile_cpus = set(cpus[max_workers:]) if pin_cpus else set()
+        # Without spare cores, compiling would disturb timed runs: finish it first
+        overlap = bool(compile_cpus) or not pin_cpus
+        compile_jobs = len(compile_cpus) or len(cpus)
+        
+        pinning = f"pinned to CPUs {pinned}" if pinned else "unpinned"
+        print(f"🔨 Compile stage: {compile_jobs} jobs" + (f" on CPUs {sorted(compile_cpus)}" if compile_cpus else ""))
+        print(f"🚀 Run stage: {max_workers} workers ({pinning}), longest first...")
+        start_time = time.perf_counter()
+        durations = []
+        
+        def finish(future):
+            result = future.result()
+            record(result)
+            durations.append(result.duration)
+            
+            # Print progress
+            status = "✅" if result.success else "❌"
+            core = f", CPU {result.cpu}" if result.cpu is not None else ""
+            print(f"{status} {result.problem} ({result.duration:.2f}s{core})")
+        
+        compile_cache = CompileCache()
+        pch = PrecompiledHeader(CPP_COMPILER, CPP_FLAGS)
+        pch.include_dir()  # build the shared .gch once, before the compile threads start
+        # Compile stage -> run stage; the longest estimated problem that is ready runs next
+        ready = queue.PriorityQueue()
+        # finished_at: seconds from start_time until the last compile future resolved
+        compile_stats = {"built": 0, "failed": 0, "remaining": len(problems), "finished_at": None}
+        stats_lock = threading.Lock()
+        
+        def compiled(future):
+            built = failed = 0
+            try:
+                problem, built, failed = future.result()
+            except Exception:
+                # The run stage compiles again and reports the error properly
+                problem = compile_futures[future]
+            with stats_lock:
+                compile_stats["built"] += built
+                compile_stats["failed"] += failed
+                compile_stats["remaining"] -= 1
+                if not compile_stats["remaining"]:
+                    compile_stats["finished_at"] = time.perf_counter() - start_time
+            ready.put((-estimates[problem], str(problem), problem))
+        
+        with ThreadPoolExecutor(max_workers=compile_jobs, initializer=init_compiler_thread,
+                                initargs=(compile_cpus,)) as compiler, \
+             ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=(pinned, multiprocessing.Value('i', 0))) as executor:
+            compile_futures = {}
+            for problem in problems:
+                compile_futures[compiler.submit(precompile_problem, problem, compile_cache, pch)] = problem
+            for future in compile_futures:
+                future.add_done_callback(compiled)
+            if not overlap:
+                wait(compile_futures)
+            
+            running = set()
+            handed_over = 0
+            try:
+                while handed_over < len(problems) or running:
+                    # Fill free workers only, so the queue keeps deciding what runs next
+                    while len(running) < max_workers and handed_over < len(problems):
+                        try:
+                            _, _, problem = ready.get(block=not running)
+                        except queue.Empty:
+                            break
+                        running.add(executor.submit(run_problem, problem, self.platforms_dir, 1))
+                        handed_over += 1
+                    
+                    done, running = wait(running, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
+            except KeyboardInterrupt:
+                # Drop the queue but keep the results of problems already running
+                print("\n⚠️  Interrupted: waiting for running problems (Ctrl-C again to abort)")
+                for future in list(compile_futures) + list(running):
+                    future.cancel()
+                for future in as_completed([f for f in running if not f.cancelled()]):
+                    finish(future)
+                raise
+        
+        # The executors have shut down, so every compile callback has run
+        compile_time = compile_stats["finished_at"]
+        print(f"🔨 Compile stage: {compile_stats['built']} built, {compile_stats['failed']} failed, "
+              f"{len(problems)} problems ready after {compile_time:.2f}s")
+        
+        # Ideal makespan: perfect packing of this run's durations onto the workers,
+        # after the compile stage when the stages couldn't overlap
+        ideal = max(sum(durations) / max_workers, max(durations))
+        return {
+            "workers": max_workers,
+            "compile_jobs": compile_jobs,
+            "compile_time": compile_time,
+            "makespan": time.perf_counter() - start_time,
+            "ideal_makespan": ideal if overlap else ideal + compile_time,
+            "estimated_total": sum(estimates.values())
+        }
+    
+    def differential_test(self, platform=None, max_workers=None, pin_cpus=True, max_tests=2):
+        """Run every language of every problem on the same inputs and compare them"""
+        problems = [p for p in self.find_all_problems(platform) if len(self.solution_languages(p)) > 1]
+        if not problems:
+            print("❌ No problems with more than one language found!")
+            return
+        
+        cpus = available_cpus()
+        pin_cpus = pin_cpus and hasattr(os, 'sched_setaffinity')
+        max_workers = min(max_workers or len(cpus), len(cpus)) if pin_cpus else (max_workers or len(cpus))
+        pinned = cpus[:max_workers] if pin_cpus else []
+        print(f"🔀 Differential testing {len(problems)} problems on {max_workers} workers...")
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=(pinned, multiprocessing.Value('i', 0))) as executor:
+            futures = [executor.submit(run_differential, problem, self.platforms_dir, max_tests) for problem in problems]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                
+                if result.error:
+                    status = "⚠️ "
+                elif result.disagreements:
+                    status = "❌"
+                else:
+                    status = "✅"
+                ratio = f", Python {result.speed_ratio:.1f}x C++" if result.speed_ratio else ""
+                print(f"{status} {result.problem} ({result.inputs} inputs{ratio})")
+        
+        results.sort(key=lambda r: r.problem)
+        self.print_differential_summary(results)
+        
+        results_file = self.root_dir / "differential_results.json"
+        with open(results_file, 'w') as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(),
+                "total_problems": len(results),
+                "disagreeing": sum(1 for r in results if r.disagreements),
+                "at_risk": sum(1 for r in results if r.at_risk),
+                "results": [r.to_dict() for r in results]
+            }, f, indent=2)
+        print(f"\n📊 Detailed results saved to: {results_file}")
+        return results
+    
+    def solution_languages(self, problem_dir):
+        return [name for name in ("solution.cpp", "solution.py", "Solution.java") if (problem_dir / name).exists()]
+    
+    def print_differential_summary(self, results):
+        print("\n" + "="*60)
+        print("DIFFERENTIAL TEST SUMMARY")
+        print("="*60)
+        
+        disagreeing = [r for r in results if r.disagreements]
+        print(f"✅ Agreeing: {sum(1 for r in results if not r.disagreements and not r.error)}")
+        print(f"❌ Disagreeing: {len(disagreeing)}")
+        for result in disagreeing:
+            first = result.disagreements[0]
+            print(f"   - {result.problem}: {first['lang']} vs {first['reference']} on {first['input']} "
+                  f"({first['mismatch']})" + (f" and {len(result.disagreements) - 1} more" if len(result.disagreements) > 1 else ""))
+        
+        skipped = [r for r in results if r.error]
+        if skipped:
+            print(f"⚠️  Not compared: {len(skipped)}")
+            for result in skipped:
+                print(f"   - {result.problem}: {result.error}")
+        
+        failing = [r for r in results if r.failures]
+        if failing:
+            print(f"💥 Crashes or timeouts:")
+            for result in failing:
+                for failure in result.failures[:3]:
+                    where = f" on {failure['input']}" if failure["input"] else ""
+                    print(f"   - {result.problem}: {failure['lang']}{where}: {failure['reason']}")
+        
+        ratios = sorted((r for r in results if r.speed_ratio), key=lambda r: -r.speed_ratio)
+        if ratios:
+            print(f"\n🐍 Python / C++ CPU time (slowest first):")
+            for result in ratios:
+                python_max = result.max_times.get('python', 0.0)
+                risk = " ⏰ TLE risk" if result.at_risk else ""
+                print(f"   {result.speed_ratio:>7.1f}x  {result.problem} "
+                      f"(Python max {python_max:.3f}s, limit {result.time_limit:.2f}s){risk}")
+    
+    def coordinate(self, platform=None, host="127.0.0.1", port=DEFAULT_QUEUE_PORT, changed_only=False, resume=False):
+        """Serve problems longest-first to TCP workers until every result is back"""
+        problems = self.find_all_problems(platform)
+        if not problems:
+            print("❌ No problems found!")
+            return
+        
+        results_file = self.root_dir / "batch_test_results.json"
+        log = ResultsLog(results_file.with_suffix('.jsonl'))
+        done = log.read() if resume else {}
+        
+        manifest = self.load_manifest()
+        toolchain = toolchain_fingerprint()
+        fingerprints = {p: problem_fingerprint(p, toolchain) for p in problems}
+        problems, cached_results = self.select_problems(problems, manifest, fingerprints, changed_only, done)
+        problems, _ = self.schedule(problems, self.load_durations(manifest, results_file))
+        
+        log.open(resume)
+        for result in cached_results:
+            log.append(self.manifest_result(result))
+        fresh = []
+        work_queue = WorkQueue(
+            [str(p.relative_to(self.platforms_dir)) for p in problems],
+            on_result=self.result_recorder(manifest, fingerprints, log, fresh)
+        )
+        
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer((host, port), QueueHandler)
+        server.daemon_threads = True
+        server.work_queue = work_queue
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        print(f"📡 Serving {len(problems)} problems on {host}:{port}")
+        print(f"   Start workers with: python3 scripts/batch_operations.py worker --host <this host> --port {port}")
+        start_time = time.perf_counter()
+        try:
+            work_queue.done.wait()
+            work_queue.wait_for_workers(WORKER_GOODBYE_TIMEOUT)
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Interrupted after {len(fresh)} problems; continue with --resume")
+        finally:
+            server.shutdown()
+            server.server_close()
+            with work_queue.lock:
+                work_queue.on_result = None
+                log.close()
+                self.save_manifest(manifest)
+        
+        schedule = {"queue": f"{host}:{port}", "makespan": time.perf_counter() - start_time}
+        
+        results = sorted(
+            list(done.values()) + [r.summary() for r in cached_results] + list(work_queue.results.values()),
+            key=lambda r: r.problem
+        )
+        self.print_test_summary(results)
+        self.save_batch_results(results, schedule=schedule, results_file=results_file, log=log)
+        return results
+    
+    def queue_worker(self, host="127.0.0.1", port=DEFAULT_QUEUE_PORT):
+        """Pull problems from a coordinator and test them in this checkout until the queue is empty"""
+        with socket.create_connection((host, port)) as conn:
+            reader = conn.makefile('r')
+            writer = conn.makefile('w')
+            result = None
+            tested = 0
+            while True:
+                writer.write(json.dumps({"result": result.to_dict() if result else None}) + "\n")
+                writer.flush()
+                line = reader.readline()
+                if not line:
+                    print("❌ Coordinator closed the connection")
+                    break
+                reply = json.loads(line)
+                result = None
+                if reply.get("problem") is None:
+                    break
+                
+                print(f"🧪 {reply['problem']}")
+                result = self.test_problem(self.platforms_dir / reply["problem"])
+                tested += 1
+                status = "✅" if result.success else "❌"
+                print(f"{status} Done ({result.duration:.2f}s)")
+        print(f"👋 Queue empty, tested {tested} problems")
+    
+    def print_test_summary(self, results, contention=None, schedule=None):
         """Print summary of batch test results"""
         print("\n" + "="*60)
         print("BATCH TEST SUMMARY")
         print("="*60)
         
-        passed = sum(1 for r in results if r["success"])
+        passed = sum(1 for r in results if r.success)
         total = len(results)
         
         print(f"✅ Passed: {passed}")
         print(f"❌ Failed: {total - passed}")
-        print(f"📊 Success Rate: {passed/total*100:.1f}%")
+        if total:
+            print(f"📊 Success Rate: {passed/total*100:.1f}%")
         
         if total - passed > 0:
             print(f"\n❌ Failed problems:")
             for result in results:
-                if not result["success"]:
-                    print(f"   - {result['problem']}")
-                    if result.get("error"):
-                        print(f"     Error: {result['error']}")
+                if not result.success:
+                    verdicts = ", ".join(f"{status}: {count}" for status, count in result.verdicts.items())
+                    cached = " [cached]" if result.cached else ""
+                    print(f"   - {result.problem}{cached}" + (f" ({verdicts})" if verdicts else ""))
+                    if result.error:
+                        print(f"     Error: {result.error}")
+        
+        if schedule:
+            efficiency = schedule["ideal_makespan"] / schedule["makespan"] if schedule["makespan"] else 1.0
+            print(f"\n🗓️  Makespan: {schedule['makespan']:.2f}s achieved vs {schedule['ideal_makespan']:.2f}s ideal "
+                  f"on {schedule['workers']} workers ({efficiency*100:.0f}% efficient)")
+        
+        if contention:
+            print(f"\n⏱️  Timing noise: {contention['slowdown']*100:+.1f}% slowdown under load, "
+                  f"CV {contention['baseline_cv']*100:.1f}% alone vs {contention['loaded_cv']*100:.1f}% in batch")
+            if contention["slowdown"] > CONTENTION_WARNING:
+                print("⚠️  Contention is high: re-run TLE problems alone (or with fewer workers) before trusting them")
     
-    def save_batch_results(self, results):
-        """Save batch test results to file"""
-        results_file = self.root_dir / "batch_test_results.json"
+    def save_batch_results(self, results, contention=None, schedule=None, results_file=None, shards=None, log=None):
+        """
+        Save batch test results, with per-case verdicts and timings, to file.
+        With a ResultsLog the per-case details are streamed from it, one problem at a time.
+        """
+        results_file = Path(results_file) if results_file else self.root_dir / "batch_test_results.json"
         
         data = {
             "timestamp": datetime.now().isoformat(),
             "total_problems": len(results),
-            "passed": sum(1 for r in results if r["success"]),
-            "results": results
+            "passed": sum(1 for r in results if r.success),
+            "contention": contention,
+            "schedule": schedule
         }
+        if shards:
+            data["shards"] = shards
         
-        with open(results_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        if log is None:
+            data["results"] = [r.to_dict() for r in results]
+            with open(results_file, 'w') as f:
+                json.dump(data, f, indent=2)
+        else:
+            with open(results_file, 'w') as f:
+                f.write(json.dumps(data, indent=2)[:-2] + ',\n  "results": [')
+                for i, entry in enumerate(log):
+                    f.write((",\n    " if i else "\n    ") + json.dumps(entry))
+                f.write("\n  ]\n}\n")
         
         print(f"\n📊 Detailed results saved to: {results_file}")
     
+    def merge_results(self, shard_files, results_file=None):
+        """Combine shard result files into one batch_test_results.json"""
+        results = {}
+        shards = []
+        for shard_file in shard_files:
+            try:
+                with open(shard_file, 'r') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"❌ Could not read {shard_file}: {e}")
+                return None
+            shards.append({
+                "file": str(shard_file),
+                "timestamp": data.get("timestamp"),
+                "total_problems": data.get("total_problems"),
+                "schedule": data.get("schedule"),
+                "contention": data.get("contention")
+            })
+            for result in data.get("results", []):
+                # A problem in several files (e.g. a re-run shard): the later file wins
+                results[result["problem"]] = ProblemResult.from_dict(result)
+        
+        results = sorted(results.values(), key=lambda r: r.problem)
+        print(f"🧩 Merged {len(shard_files)} shard files, {len(results)} problems")
+        self.print_test_summary(results)
+        self.save_batch_results(results, results_file=results_file, shards=shards)
+        return results
+    
     def add_headers_batch(self, platform=None, author="Competitive Programmer"):
         """Add headers to all problems"""
         problems = self.find_all_problems(platform)
@@ -171,22 +1122,60 @@ class BatchOperations:
 
 def main():
     parser = argparse.ArgumentParser(description='Batch operations for competitive programming')
-    parser.add_argument('command', choices=['test', 'header'], help='Operation to perform')
+    parser.add_argument('command', choices=['test', 'diff', 'header', 'merge', 'coordinator', 'worker'], help='Operation to perform')
+    parser.add_argument('files', nargs='*', help='Shard result files (merge only)')
     parser.add_argument('--platform', help='Specific platform to operate on')
     parser.add_argument('--author', default='Competitive Programmer', help='Author name for headers')
     parser.add_argument('--no-parallel', action='store_true', help='Disable parallel execution')
-    parser.add_argument('--max-workers', type=int, default=4, help='Maximum parallel workers')
+    parser.add_argument('--max-workers', type=int, help='Maximum parallel run workers (default: half the available CPUs, the rest compile)')
+    parser.add_argument('--no-pin', action='store_true', help='Do not pin each worker to its own CPU')
+    parser.add_argument('--changed', action='store_true', help='Only re-test problems whose sources, tests or flags changed')
+    parser.add_argument('--resume', action='store_true', help='Skip problems already in the JSON Lines results log')
+    parser.add_argument('--shard', type=parse_shard, help='Only test shard i of n (e.g. 2/4), split by a stable hash')
+    parser.add_argument('--output', help='Results file (default: batch_test_results.json, or one per shard)')
+    parser.add_argument('--max-tests', type=int, default=2, help='Generated max tests per problem (diff only, needs gen.py/gen.cpp and "max_n")')
+    parser.add_argument('--host', default='127.0.0.1', help='Coordinator address (coordinator/worker)')
+    parser.add_argument('--port', type=int, default=DEFAULT_QUEUE_PORT, help='Coordinator port (coordinator/worker)')
     
     args = parser.parse_args()
     
     batch_ops = BatchOperations()
     
     if args.command == 'test':
+        results_file = args.output
+        if args.shard and not results_file:
+            results_file = batch_ops.root_dir / f"batch_test_results.shard-{args.shard[0]}-of-{args.shard[1]}.json"
         batch_ops.batch_test(
             platform=args.platform,
             parallel=not args.no_parallel,
-            max_workers=args.max_workers
+            max_workers=args.max_workers,
+            pin_cpus=not args.no_pin,
+            changed_only=args.changed,
+            shard=args.shard,
+            results_file=results_file,
+            resume=args.resume
+        )
+    elif args.command == 'diff':
+        batch_ops.differential_test(
+            platform=args.platform,
+            max_workers=args.max_workers,
+            pin_cpus=not args.no_pin,
+            max_tests=args.max_tests
+        )
+    elif args.command == 'merge':
+        if not args.files:
+            parser.error("merge needs at least one shard result file")
+        batch_ops.merge_results(args.files, results_file=args.output)
+    elif args.command == 'coordinator':
+        batch_ops.coordinate(
+            platform=args.platform,
+            host=args.host,
+            port=args.port,
+            changed_only=args.changed,
+            resume=args.resume
         )
+    elif args.command == 'worker':
+        batch_ops.queue_worker(host=args.host, port=args.port)
     elif args.command == 'header':
         batch_ops.add_headers_batch(
             platform=args.platform,
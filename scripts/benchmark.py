@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Complexity Benchmark for Competitive Programming Solutions
+Runs a solution on generated inputs of geometrically increasing size up to the
+problem's maximum n, fits the CPU-time curve against common complexity classes and
+compares the result with the "Time Complexity: O(...)" line in the solution header.
+Solutions projected to exceed the time limit at max n are flagged.
+
+The generator is called as `gen <n> <seed>` and must print one test of size n.
+
+Usage:
+    python3 scripts/benchmark.py <problem_dir> gen.py --max-n 200000
+"""
+
+import re
+import sys
+import json
+import math
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import datetime
+import argparse
+
+from test_solution import SolutionTester
+
+# Candidate complexity classes: name -> f(n)
+COMPLEXITY_MODELS = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(sqrt n)": lambda n: math.sqrt(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n log^2 n)": lambda n: n * math.log2(n) ** 2,
+    "O(n sqrt n)": lambda n: n * math.sqrt(n),
+    "O(n^2)": lambda n: n ** 2,
+    "O(n^2 log n)": lambda n: n ** 2 * math.log2(n),
+    "O(n^3)": lambda n: n ** 3,
+}
+
+# Effective polynomial exponent of each class (log factors counted as ~0.1)
+MODEL_EXPONENTS = {
+    "O(1)": 0.0, "O(log n)": 0.1, "O(sqrt n)": 0.5, "O(n)": 1.0, "O(n log n)": 1.1,
+    "O(n log^2 n)": 1.2, "O(n sqrt n)": 1.5, "O(n^2)": 2.0, "O(n^2 log n)": 2.1, "O(n^3)": 3.0,
+}
+
+# Times below this are dominated by process startup and timer resolution
+MIN_FIT_TIME = 0.01
+
+def normalize_complexity(text):
+    """Map a declared complexity like 'O(N log N)' or 'O(n²)' to a model name, or None"""
+    body = text.strip()
+    match = re.match(r'^O\((.*)\)$', body, re.IGNORECASE)
+    if match:
+        body = match.group(1)
+    body = body.lower().replace(' ', '').replace('*', '').replace('⋅', '').replace('·', '')
+    body = body.replace('²', '^2').replace('³', '^3').replace('√n', 'sqrtn').replace('sqrt(n)', 'sqrtn')
+    body = body.replace('lg', 'log').replace('log(n)', 'logn').replace('logn^2', 'log^2n').replace('(logn)^2', 'log^2n')
+    # Treat other size variables (m, q, ...) as n
+    body = re.sub(r'\b[mkq]\b', 'n', body)
+    aliases = {
+        "1": "O(1)", "logn": "O(log n)", "sqrtn": "O(sqrt n)", "n": "O(n)",
+        "nlogn": "O(n log n)", "nlog^2n": "O(n log^2 n)", "nsqrtn": "O(n sqrt n)",
+        "n^2": "O(n^2)", "nn": "O(n^2)", "n^2logn": "O(n^2 log n)", "n^3": "O(n^3)",
+    }
+    return aliases.get(body)
+
+def declared_complexity(solution_file):
+    """The 'Time Complexity: O(...)' value from a solution header, or None"""
+    try:
+        with open(solution_file, 'r') as f:
+            for line in f:
+                match = re.search(r'Time Complexity:\s*(O\(.*\))', line, re.IGNORECASE)
+                if match:
+                    return match.group(1).strip()
+    except OSError:
+        pass
+    return None
+
+def fit_models(samples):
+    """
+    Fit t = c * f(n) for every model (least squares in log space).
+    Returns (model scores sorted best first, empirical exponent from a log-log fit).
+    """
+    points = [(n, t) for n, t in samples if t >= MIN_FIT_TIME]
+    if len(points) < 3:
+        points = [(n, max(t, 1e-6)) for n, t in samples]
+    if len(points) < 2:
+        return [], None
+
+    log_n = [math.log(n) for n, _ in points]
+    log_t = [math.log(t) for _, t in points]
+    mean_n = sum(log_n) / len(log_n)
+    mean_t = sum(log_t) / len(log_t)
+    var_n = sum((x - mean_n) ** 2 for x in log_n)
+    exponent = sum((x - mean_n) * (y - mean_t) for x, y in zip(log_n, log_t)) / var_n if var_n else None
+
+    scores = []
+    for name, model in COMPLEXITY_MODELS.items():
+        # In log space the best constant is the mean residual; score is the remaining variance
+        residuals = [math.log(t) - math.log(max(model(n), 1e-12)) for n, t in points]
+        log_c = sum(residuals) / len(residuals)
+        error = sum((r - log_c) ** 2 for r in residuals) / len(residuals)
+        scores.append({"model": name, "constant": math.exp(log_c), "error": error})
+    scores.sort(key=lambda s: s["error"])
+    return scores, exponent
+
+class ComplexityBenchmark:
+    def __init__(self, problem_path, generator, lang=None):
+        self.tester = SolutionTester(problem_path, cold_start=True)
+        self.problem_dir = self.tester.problem_dir
+        self.generator = generator
+        self.lang = lang
+        self.results = {}
+
+    def generator_command(self):
+        return self.tester.prepare_program(self.generator, "generator")
+
+    def prepare_solution(self):
+        solutions = self.tester.find_solution_files()
+        if self.lang:
+            solutions = {k: v for k, v in solutions.items() if k == self.lang}
+        if not solutions:
+            raise RuntimeError("No matching solution files found")
+
+        lang, source = next(iter(solutions.items()))
+        executable = source
+        if lang == 'cpp':
+            executable = self.tester.compile_cpp(source)
+        elif lang == 'java':
+            executable = self.tester.compile_java(source)
+        if not executable:
+            raise RuntimeError("Compilation failed")
+        return lang, source, self.tester.build_command(executable, lang)
+
+    def sizes(self, max_n, min_n, factor):
+        sizes = []
+        n = max_n
+        while n >= min_n:
+            sizes.append(int(n))
+            n /= factor
+        return sorted(set(sizes))
+
+    def run(self, max_n=None, min_n=100, factor=2.0, repeats=3, seed=1):
+        self.tester.load_metadata()
+        if max_n is None:
+            max_n = self.tester.metadata.get('max_n')
+        if not max_n:
+            print("❌ Maximum n unknown: pass --max-n or add \"max_n\" to metadata.json")
+            return None
+
+        try:
+            gen_command = self.generator_command()
+            lang, source, command = self.prepare_solution()
+        except Exception as e:
+            print(f"❌ {e}")
+            return None
+
+        print(f"\n📈 Benchmarking {lang.upper()} solution up to n = {max_n}")
+        print(f"{'n':>12} {'CPU time':>10} {'Memory':>10}")
+
+        samples = []
+        timeout_n = None
+        with tempfile.TemporaryDirectory(prefix="cp-bench-") as tmp:
+            input_path = Path(tmp) / "input.txt"
+            output_path = Path(tmp) / "output.txt"
+            for n in self.sizes(max_n, min(min_n, max_n), factor):
+                with open(input_path, 'w') as f:
+                    gen = subprocess.run(gen_command + [str(n), str(seed)], stdout=f, stderr=subprocess.PIPE, text=True)
+                if gen.returncode != 0:
+                    print(f"❌ Generator failed for n = {n}: {gen.stderr.strip()}")
+                    break
+
+                runs = [self.tester.execute(command, input_file=input_path, output_path=output_path)
+                        for _ in range(repeats)]
+                if any(r["timed_out"] or r["returncode"] != 0 for r in runs):
+                    timed_out = any(r["timed_out"] for r in runs)
+                    print(f"{n:>12} {'timeout' if timed_out else 'runtime error':>10}")
+                    if timed_out:
+                        timeout_n = n
+                    break
+
+                best = min(r["cpu_time"] for r in runs)
+                memory_kb = max(r["memory_kb"] or 0 for r in runs)
+                samples.append((n, best))
+                print(f"{n:>12} {best:>9.3f}s {memory_kb / 1024:>8.1f}MB")
+                if best > self.tester.time_limit:
+                    # Larger sizes can only be slower
+                    timeout_n = n
+                    break
+
+        return self.report(lang, source, samples, max_n, timeout_n)
+
+    def report(self, lang, source, samples, max_n, timeout_n=None):
+        """timeout_n is the size that actually exceeded the time limit, if any"""
+        scores, exponent = fit_models(samples)
+        if not scores and timeout_n is None:
+            print("❌ Not enough measurements to estimate complexity")
+            return None
+
+        declared = declared_complexity(source)
+        declared_model = normalize_complexity(declared) if declared else None
+
+        print(f"\n{'='*60}")
+        print("COMPLEXITY ESTIMATE")
+        print(f"{'='*60}")
+        best = scores[0] if scores else None
+        if best:
+            print(f"Empirical exponent: n^{exponent:.2f}" if exponent is not None else "Empirical exponent: unknown")
+            print(f"Best fit: {best['model']} (runner-up: {scores[1]['model']})")
+            if max(t for _, t in samples) < MIN_FIT_TIME:
+                print(f"⚡ Every run took under {MIN_FIT_TIME * 1000:.0f}ms, so the estimate is unreliable")
+        else:
+            print("Not enough measurements to fit a complexity class")
+
+        if declared is None or declared.replace(' ', '') == 'O()':
+            print("Declared: (not filled in)")
+        elif declared_model is None:
+            print(f"Declared: {declared} (not recognized)")
+        elif best:
+            gap = MODEL_EXPONENTS[best["model"]] - MODEL_EXPONENTS[declared_model]
+            verdict = "✅ consistent" if abs(gap) <= 0.3 else ("❌ slower than declared" if gap > 0 else "⚠️  faster than declared")
+            print(f"Declared: {declared} (exponent {MODEL_EXPONENTS[declared_model]:.1f}) {verdict}")
+        else:
+            print(f"Declared: {declared}")
+
+        if timeout_n is not None:
+            # A real timeout at or below max n settles it; no projection needed
+            time_at_max = None
+            at_risk = True
+            print(f"⏰ Solution exceeded the time limit ({self.tester.time_limit:.2f}s) at n = {timeout_n} "
+                  f"(max n = {max_n})!")
+        else:
+            projected = best["constant"] * COMPLEXITY_MODELS[best["model"]](max_n)
+            measured_max = dict(samples).get(max_n)
+            time_at_max = measured_max if measured_max is not None else projected
+            source_label = "measured" if measured_max is not None else "projected"
+            print(f"Time at max n = {max_n}: {time_at_max:.3f}s ({source_label}), limit {self.tester.time_limit:.2f}s")
+            at_risk = time_at_max > self.tester.time_limit
+            if at_risk:
+                print("⏰ Solution is projected to exceed the time limit at max n!")
+
+        self.results = {
+            "timestamp": datetime.now().isoformat(),
+            "lang": lang,
+            "samples": [{"n": n, "time": t} for n, t in samples],
+            "exponent": exponent,
+            "best_fit": best["model"] if best else None,
+            "declared": declared,
+            "time_at_max_n": time_at_max,
+            "timeout_n": timeout_n,
+            "time_limit": self.tester.time_limit,
+            "at_risk": at_risk
+        }
+        results_file = self.problem_dir / "benchmark_results.json"
+        with open(results_file, 'w') as f:
+            json.dump(self.results, f, indent=2)
+        print(f"\n📊 Results saved to: {results_file}")
+        return self.results
+
+def growth_factor(value):
+    """argparse type for --factor: sizes shrink by it, so it must exceed 1"""
+    factor = float(value)
+    if not factor > 1:
+        raise argparse.ArgumentTypeError(f"must be greater than 1, got {value}")
+    return factor
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate the empirical complexity of a solution')
+    parser.add_argument('problem_path', help='Path to problem directory')
+    parser.add_argument('generator', help='Input generator (.py/.cpp), called as "gen <n> <seed>"')
+    parser.add_argument('--max-n', type=int, help='Largest n allowed by the constraints (default: metadata.json "max_n")')
+    parser.add_argument('--min-n', type=int, default=100, help='Smallest n to measure')
+    parser.add_argument('--factor', type=growth_factor, default=2.0, help='Growth factor between sizes (> 1)')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per size (minimum CPU time is used)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed passed to the generator')
+    parser.add_argument('--lang', choices=['cpp', 'python', 'java'], help='Solution to benchmark (default: first found)')
+
+    args = parser.parse_args()
+
+    benchmark = ComplexityBenchmark(args.problem_path, args.generator, lang=args.lang)
+    results = benchmark.run(
+        max_n=args.max_n,
+        min_n=args.min_n,
+        factor=args.factor,
+        repeats=args.repeats,
+        seed=args.seed
+    )
+    sys.exit(1 if results and results["at_risk"] else 0)
+
+if __name__ == "__main__":
+    main()
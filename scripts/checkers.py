@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Output Checkers for Competitive Programming Solutions
+Compare a solution's output with the expected output without loading either into
+memory: both sides are read in chunks and comparison stops at the first mismatch.
+
+Available checkers:
+    exact      - lines must match exactly (trailing blank lines and CR ignored)
+    token      - whitespace-separated tokens must match (default)
+    float      - like token, but numbers may differ by an absolute/relative epsilon
+    unordered  - same multiset of lines, in any order
+
+Usage:
+    python3 scripts/checkers.py output.txt expected.txt --checker float --abs-eps 1e-6
+"""
+
+import io
+import re
+import argparse
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+TOKEN_RE = re.compile(rb'\S+')
+
+def open_stream(source):
+    """Binary stream for a path, bytes/str content or an already open file"""
+    if source is None:
+        return io.BytesIO(b'')
+    if isinstance(source, str):
+        return io.BytesIO(source.encode())
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, Path):
+        return open(source, 'rb')
+    return source
+
+def iter_tokens(stream, chunk_size=CHUNK_SIZE):
+    """Yield (token, line_number) for every whitespace-separated token, chunk by chunk"""
+    line = 1
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buf = pending + chunk
+        pending = b''
+        pos = 0
+        for match in TOKEN_RE.finditer(buf):
+            line += buf.count(b'\n', pos, match.start())
+            if match.end() == len(buf):
+                # Token may continue in the next chunk
+                pending = match.group()
+                pos = len(buf)
+                break
+            yield match.group(), line
+            pos = match.end()
+        else:
+            line += buf.count(b'\n', pos)
+    if pending:
+        yield pending, line
+
+def iter_lines(stream, chunk_size=CHUNK_SIZE):
+    """Yield (line, line_number) without the trailing newline or CR"""
+    number = 1
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        parts = (pending + chunk).split(b'\n')
+        pending = parts.pop()
+        for part in parts:
+            yield part.rstrip(b'\r'), number
+            number += 1
+    if pending:
+        yield pending.rstrip(b'\r'), number
+
+def show(token, limit=40):
+    text = token.decode(errors='replace')
+    return text if len(text) <= limit else text[:limit] + '...'
+
+class Checker:
+    """Base class: check() returns (ok, message) where message locates the first mismatch"""
+    name = None
+
+    def check(self, actual, expected):
+        actual_stream = open_stream(actual)
+        expected_stream = open_stream(expected)
+        try:
+            return self.compare(actual_stream, expected_stream)
+        finally:
+            for stream, source in ((actual_stream, actual), (expected_stream, expected)):
+                if stream is not source:
+                    stream.close()
+
+    def compare(self, actual, expected):
+        raise NotImplementedError
+
+class TokenChecker(Checker):
+    name = 'token'
+
+    def tokens_equal(self, got, want):
+        return got == want
+
+    def compare(self, actual, expected):
+        index = 0
+        actual_tokens = iter_tokens(actual)
+        for want, want_line in iter_tokens(expected):
+            index += 1
+            got = next(actual_tokens, None)
+            if got is None:
+                return False, f"token {index} (line {want_line}): expected '{show(want)}', got end of output"
+            got, got_line = got
+            if not self.tokens_equal(got, want):
+                return False, f"token {index} (line {got_line}): expected '{show(want)}', got '{show(got)}'"
+        extra = next(actual_tokens, None)
+        if extra is not None:
+            return False, f"token {index + 1} (line {extra[1]}): expected end of output, got '{show(extra[0])}'"
+        return True, f"{index} tokens"
+
+class FloatChecker(TokenChecker):
+    name = 'float'
+
+    def __init__(self, abs_eps=1e-6, rel_eps=1e-6):
+        self.abs_eps = abs_eps
+        self.rel_eps = rel_eps
+
+    def tokens_equal(self, got, want):
+        if got == want:
+            return True
+        try:
+            got_value = float(got)
+            want_value = float(want)
+        except ValueError:
+            return False
+        diff = abs(got_value - want_value)
+        return diff <= self.abs_eps or diff <= self.rel_eps * abs(want_value)
+
+class ExactChecker(Checker):
+    name = 'exact'
+
+    def compare(self, actual, expected):
+        actual_lines = iter_lines(actual)
+        for want, want_line in iter_lines(expected):
+            got = next(actual_lines, None)
+            if got is None:
+                if want.strip():
+                    return False, f"line {want_line}: expected '{show(want)}', got end of output"
+                continue
+            got, _ = got
+            if got != want:
+                return False, f"line {want_line}: expected '{show(want)}', got '{show(got)}'"
+        for got, got_line in actual_lines:
+            if got.strip():
+                return False, f"line {got_line}: expected end of output, got '{show(got)}'"
+        return True, "identical"
+
+class UnorderedLinesChecker(Checker):
+    name = 'unordered'
+
+    def compare(self, actual, expected):
+        # Only line hashes are kept, never the lines themselves
+        counts = {}
+        for want, _ in iter_lines(expected):
+            want = want.strip()
+            if want:
+                key = hash(want)
+                counts[key] = counts.get(key, 0) + 1
+        for got, got_line in iter_lines(actual):
+            got = got.strip()
+            if not got:
+                continue
+            key = hash(got)
+            if not counts.get(key):
+                return False, f"line {got_line}: unexpected line '{show(got)}'"
+            counts[key] -= 1
+        missing = sum(counts.values())
+        if missing:
+            return False, f"{missing} expected line(s) missing from output"
+        return True, "same lines"
+
+CHECKERS = {
+    checker.name: checker for checker in (ExactChecker, TokenChecker, FloatChecker, UnorderedLinesChecker)
+}
+
+def get_checker(name='token', **options):
+    """Instantiate a checker by name; options are only used by the float checker"""
+    if name not in CHECKERS:
+        raise ValueError(f"Unknown checker: {name} (choose from {', '.join(CHECKERS)})")
+    if name == 'float':
+        return FloatChecker(**{k: v for k, v in options.items() if v is not None})
+    return CHECKERS[name]()
+
+def read_excerpt(source, limit=4096):
+    """First `limit` bytes of a source as text, with a marker if truncated"""
+    stream = open_stream(source)
+    try:
+        data = stream.read(limit + 1)
+    finally:
+        if stream is not source:
+            stream.close()
+    text = data[:limit].decode(errors='replace')
+    return text + "\n... (truncated)" if len(data) > limit else text
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare an output file with the expected output')
+    parser.add_argument('output', help='Output produced by the solution')
+    parser.add_argument('expected', help='Expected output')
+    parser.add_argument('--checker', choices=list(CHECKERS), default='token', help='Comparison mode')
+    parser.add_argument('--abs-eps', type=float, help='Absolute tolerance for the float checker')
+    parser.add_argument('--rel-eps', type=float, help='Relative tolerance for the float checker')
+
+    args = parser.parse_args()
+
+    checker = get_checker(args.checker, abs_eps=args.abs_eps, rel_eps=args.rel_eps)
+    ok, message = checker.check(Path(args.output), Path(args.expected))
+    print(f"✅ Outputs match ({message})" if ok else f"❌ Mismatch at {message}")
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
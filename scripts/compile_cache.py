@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Compile Cache for Competitive Programming Solutions
+Stores compiled binaries keyed by a hash of the source, compiler version and flags,
+so unchanged solutions never go through g++ twice. Also maintains a precompiled
+<bits/stdc++.h> matching the exact flag set, which removes most of the cost of
+the compiles that do happen.
+
+Usage:
+    python3 scripts/compile_cache.py --stats
+    python3 scripts/compile_cache.py --clear
+    python3 scripts/compile_cache.py --benchmark-pch
+"""
+
+import os
+import shutil
+import threading
+import hashlib
+import subprocess
+import argparse
+import time
+from pathlib import Path
+
+# Default cache size cap (bytes); override with CP_COMPILE_CACHE_MAX_MB
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+def default_cache_dir():
+    """Shared cache directory (CP_CACHE_DIR, then XDG_CACHE_HOME, then ~/.cache)"""
+    if os.environ.get('CP_CACHE_DIR'):
+        return Path(os.environ['CP_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'competitive-programming'
+
+_compiler_versions = {}
+
+def compiler_version(compiler):
+    """Full version banner of the compiler (memoized per process)"""
+    if compiler not in _compiler_versions:
+        try:
+            result = subprocess.run([compiler, '--version'], capture_output=True, text=True)
+            version = result.stdout.strip()
+        except OSError:
+            version = ''
+        _compiler_versions[compiler] = version
+    return _compiler_versions[compiler]
+
+# (compiler, flags, cache_dir) -> (system header, PCH directory) or None
+_pch_dirs = {}
+
+class PrecompiledHeader:
+    """
+    Builds <bits/stdc++.h> into a .gch under a directory named after a hash of the
+    compiler version, flags and header contents. Passing "-I <dir>" makes g++ pick
+    up the .gch instead of re-parsing the header; a stale or mismatched .gch is
+    simply ignored by g++ and the copied header is used instead.
+    """
+    HEADER = 'bits/stdc++.h'
+
+    def __init__(self, compiler, flags, cache_dir=None):
+        self.compiler = compiler
+        self.flags = list(flags)
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / 'pch'
+
+    def system_header(self):
+        """Locate the real bits/stdc++.h the compiler would include"""
+        std_flags = [f for f in self.flags if f.startswith('-std=')]
+        result = subprocess.run(
+            [self.compiler] + std_flags + ['-E', '-H', '-x', 'c++', '-'],
+            input=f'#include <{self.HEADER}>\n',
+            capture_output=True,
+            text=True
+        )
+        for line in result.stderr.splitlines():
+            if line.startswith('. '):
+                return Path(line[2:].strip())
+        return None
+
+    def location(self):
+        """(system header, PCH directory) for this compiler and flags, memoized per process, or None"""
+        key = (self.compiler, tuple(self.flags), self.cache_dir)
+        if key not in _pch_dirs:
+            header = self.system_header()
+            if not header or not header.exists():
+                _pch_dirs[key] = None
+            else:
+                digest = hashlib.sha256()
+                digest.update(compiler_version(self.compiler).encode())
+                digest.update(b'\0')
+                digest.update('\0'.join(self.flags).encode())
+                digest.update(b'\0')
+                digest.update(header.read_bytes())
+                _pch_dirs[key] = (header, self.cache_dir / digest.hexdigest()[:16])
+        return _pch_dirs[key]
+
+    def include_dir(self):
+        """Return the -I directory holding an up-to-date .gch, building it if needed"""
+        location = self.location()
+        if not location:
+            return None
+        header, pch_dir = location
+
+        gch = pch_dir / (self.HEADER + '.gch')
+        if gch.exists():
+            return pch_dir
+
+        gch.parent.mkdir(parents=True, exist_ok=True)
+        local_header = pch_dir / self.HEADER
+        shutil.copy2(header, local_header)
+
+        tmp_gch = gch.with_name(f"{gch.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        result = subprocess.run(
+            [self.compiler] + self.flags + ['-x', 'c++-header', str(local_header), '-o', str(tmp_gch)],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            try:
+                tmp_gch.unlink()
+            except FileNotFoundError:
+                pass
+            return None
+
+        os.replace(tmp_gch, gch)
+        return pch_dir
+
+    def flags_for(self, source_file):
+        """Extra compiler flags enabling the PCH, or [] if the source doesn't use it"""
+        try:
+            source = Path(source_file).read_text(errors='ignore')
+        except OSError:
+            return []
+        if f'<{self.HEADER}>' not in source:
+            return []
+        pch_dir = self.include_dir()
+        return ['-I', str(pch_dir)] if pch_dir else []
+
+class SizeCappedCache:
+    """
+    Cache entries stored as cache_dir/<key[:2]>/<entry>, trimmed least recently used
+    first (by mtime, which lookups refresh) to max_size bytes.
+    The cap comes from max_size, else the max_size_env variable (MB), else default_max_size.
+    """
+
+    def __init__(self, cache_dir, max_size, max_size_env, default_max_size):
+        self.cache_dir = Path(cache_dir)
+        if max_size is None:
+            max_mb = os.environ.get(max_size_env)
+            max_size = int(max_mb) * 1024 * 1024 if max_mb else default_max_size
+        self.max_size = max_size
+
+    def entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return [p for p in self.cache_dir.glob('*/*') if p.is_file() and not p.name.endswith('.tmp')]
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_size"""
+        entries = []
+        total = 0
+        for entry in self.entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        entries.sort()
+        evicted = 0
+        for _, size, entry in entries:
+            if total <= self.max_size:
+                break
+            try:
+                entry.unlink()
+                total -= size
+                evicted += 1
+            except FileNotFoundError:
+                pass
+        return evicted
+
+    def stats(self):
+        entries = self.entries()
+        return {
+            'entries': len(entries),
+            'size': sum(p.stat().st_size for p in entries),
+            'max_size': self.max_size
+        }
+
+class CompileCache(SizeCappedCache):
+
+    def __init__(self, cache_dir=None, max_size=None):
+        super().__init__(cache_dir or default_cache_dir() / 'binaries', max_size,
+                         'CP_COMPILE_CACHE_MAX_MB', DEFAULT_MAX_SIZE)
+
+    def cache_key(self, source_file, compiler, flags):
+        """Hash of source bytes, compiler version and flag list"""
+        digest = hashlib.sha256()
+        digest.update(compiler_version(compiler).encode())
+        digest.update(b'\0')
+        digest.update('\0'.join(flags).encode())
+        digest.update(b'\0')
+        digest.update(Path(source_file).read_bytes())
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return self.cache_dir / key[:2] / key
+
+    def lookup(self, key):
+        """Return the cached binary for key (and mark it recently used), or None"""
+        entry = self.entry_path(key)
+        if not entry.exists():
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key, binary):
+        """Move a freshly built binary into the cache and return its cache path"""
+        entry = self.entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Rename is atomic, so concurrent testers never see a half-written entry
+        os.replace(binary, entry)
+        self.evict()
+        return entry
+
+    def materialize(self, entry, destination):
+        """Hard-link (or copy) a cached binary to destination"""
+        destination = Path(destination)
+        try:
+            destination.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(entry, destination)
+        except OSError:
+            shutil.copy2(entry, destination)
+        return destination
+
+    def compile(self, source_file, executable, compiler, flags, extra_flags=()):
+        """
+        Compile source_file into executable, reusing a cached binary when possible.
+        extra_flags (e.g. the PCH include dir) don't change the output and are not
+        part of the cache key; pass a callable to defer computing them until a miss.
+        Returns (success, cache_hit, stderr).
+        """
+        key = self.cache_key(source_file, compiler, flags)
+        entry = self.lookup(key)
+        if entry:
+            self.materialize(entry, executable)
+            return True, True, ''
+
+        if callable(extra_flags):
+            extra_flags = extra_flags()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Unique per thread too: identical sources (e.g. templates) may compile concurrently
+        tmp_binary = self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        compile_cmd = [compiler] + list(flags) + list(extra_flags) + ["-o", str(tmp_binary), str(source_file)]
+        result = subprocess.run(compile_cmd, capture_output=True, text=True)
+
+        if result.returncode != 0:
+            try:
+                tmp_binary.unlink()
+            except FileNotFoundError:
+                pass
+            return False, False, result.stderr
+
+        entry = self.store(key, tmp_binary)
+        self.materialize(entry, executable)
+        return True, False, result.stderr
+
+    def clear(self):
+        for directory in (self.cache_dir, default_cache_dir() / 'pch'):
+            if directory.exists():
+                shutil.rmtree(directory)
+
+def benchmark_pch(root_dir, compiler, flags):
+    """Compile every solution.cpp with and without the PCH and report timings"""
+    sources = sorted((Path(root_dir) / 'platform').rglob('solution.cpp'))
+    if not sources:
+        print("❌ No C++ solutions found!")
+        return
+
+    pch = PrecompiledHeader(compiler, flags)
+    start = time.perf_counter()
+    pch_dir = pch.include_dir()
+    print(f"🔨 PCH ready in {time.perf_counter() - start:.2f}s: {pch_dir}")
+    if not pch_dir:
+        print("❌ Could not build precompiled header")
+        return
+
+    output = default_cache_dir() / f"bench.{os.getpid()}.out"
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    def timed_compile(source, extra):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [compiler] + flags + extra + ['-o', str(output), str(source)],
+            capture_output=True
+        )
+        return time.perf_counter() - start, result.returncode == 0
+
+    print(f"\n{'Solution':<50} {'No PCH':>8} {'PCH':>8} {'Speedup':>8}")
+    total_plain = total_pch = 0.0
+    for source in sources:
+        plain_time, plain_ok = timed_compile(source, [])
+        pch_time, pch_ok = timed_compile(source, pch.flags_for(source))
+        if not (plain_ok and pch_ok):
+            print(f"{str(source.parent.relative_to(root_dir)):<50} {'compile error':>26}")
+            continue
+        total_plain += plain_time
+        total_pch += pch_time
+        print(f"{str(source.parent.relative_to(root_dir)):<50} {plain_time:>7.2f}s {pch_time:>7.2f}s {plain_time / pch_time:>7.1f}x")
+
+    try:
+        output.unlink()
+    except FileNotFoundError:
+        pass
+
+    if total_pch > 0:
+        print(f"\n{'Total':<50} {total_plain:>7.2f}s {total_pch:>7.2f}s {total_plain / total_pch:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the shared compile cache')
+    parser.add_argument('--stats', action='store_true', help='Show cache size and entry count')
+    parser.add_argument('--clear', action='store_true', help='Remove all cached binaries and headers')
+    parser.add_argument('--benchmark-pch', action='store_true', help='Time compiling every solution with and without the precompiled header')
+
+    args = parser.parse_args()
+
+    cache = CompileCache()
+
+    if args.benchmark_pch:
+        from test_solution import CPP_COMPILER, CPP_FLAGS
+        benchmark_pch(Path(__file__).parent.parent, CPP_COMPILER, CPP_FLAGS)
+    elif args.clear:
+        cache.clear()
+        print(f"🧹 Cleared compile cache: {cache.cache_dir}")
+    else:
+        stats = cache.stats()
+        print(f"📦 Compile cache: {cache.cache_dir}")
+        print(f"   Entries: {stats['entries']}")
+        print(f"   Size: {stats['size'] / 1024 / 1024:.1f} MB / {stats['max_size'] / 1024 / 1024:.0f} MB")
+
+if __name__ == "__main__":
+    main()
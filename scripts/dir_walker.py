@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Directory Walker for the Problem Archive
+Lists a directory in a single os.scandir pass. File types come from the directory
+entries themselves, so no stat is needed for them, and each file is stat'ed exactly
+once, for both its size and its mtime. The same pass yields the file list, the
+languages present and the solution sources, so callers never glob or stat again.
+
+Usage:
+    python3 scripts/dir_walker.py --benchmark 50000
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+from pathlib import Path
+from contextlib import contextmanager
+
+# Source suffix -> language name as used in solutions.json
+LANGUAGES = {'.py': 'Python', '.cpp': 'C++', '.java': 'Java', '.js': 'JavaScript'}
+
+class DirectoryListing:
+    """One os.scandir pass over a directory"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = {}             # name -> [mtime_ns, size]
+        self.subdirs = []           # Paths of child directories
+        self.languages = set()
+        self.solution_files = []    # solution.<ext> sources, as determine_status expects
+
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    self.subdirs.append(Path(entry.path))
+                elif entry.is_file():
+                    stat = entry.stat()  # cached on the DirEntry
+                    self.files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+
+                    stem, suffix = os.path.splitext(entry.name)
+                    if suffix in LANGUAGES:
+                        self.languages.add(LANGUAGES[suffix])
+                        if stem == 'solution':
+                            self.solution_files.append(Path(entry.path))
+
+def build_synthetic_tree(root, problems):
+    """Archive-shaped tree: platform/<P>/<problem>/ with four files each"""
+    files = {
+        'solution.cpp': '#include <bits/stdc++.h>\nint main() {}\n',
+        'solution.py': 'print()\n',
+        'README.md': '# Problem\n',
+        'metadata.json': '{}\n'
+    }
+    per_platform = max(1, problems // 5)
+    for i in range(problems):
+        problem_dir = root / 'platform' / f"Platform{i // per_platform}" / f"problem-{i}"
+        problem_dir.mkdir(parents=True)
+        for name, content in files.items():
+            (problem_dir / name).write_text(content)
+
+class CountingEntry:
+    """DirEntry proxy that counts the stat() calls which reach the filesystem"""
+
+    def __init__(self, entry, calls):
+        self.entry = entry
+        self.calls = calls
+        self.stat_done = False
+
+    def __getattr__(self, name):
+        return getattr(self.entry, name)
+
+    def __fspath__(self):
+        return self.entry.path
+
+    def stat(self, *, follow_symlinks=True):
+        # DirEntry caches its stat result, so only the first call is a syscall
+        if not self.stat_done:
+            self.calls['stat'] += 1
+            self.stat_done = True
+        return self.entry.stat(follow_symlinks=follow_symlinks)
+
+class CountingScandir:
+    def __init__(self, iterator, calls):
+        self.iterator = iterator
+        self.calls = calls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.iterator.close()
+
+    def __iter__(self):
+        return (CountingEntry(entry, self.calls) for entry in self.iterator)
+
+    def close(self):
+        self.iterator.close()
+
+@contextmanager
+def count_fs_calls():
+    """
+    Count the stat and directory-listing calls made through the os module while
+    active (pathlib and os.scandir both go through it). Entry types come from
+    readdir; a DirEntry stat is counted once, when it actually hits the filesystem.
+    """
+    calls = {'stat': 0, 'listdir': 0}
+    real = {name: getattr(os, name) for name in ('stat', 'lstat', 'listdir', 'scandir')}
+
+    def counted_stat(name):
+        def stat(*args, **kwargs):
+            calls['stat'] += 1
+            return real[name](*args, **kwargs)
+        return stat
+
+    def listdir(*args, **kwargs):
+        calls['listdir'] += 1
+        return real['listdir'](*args, **kwargs)
+
+    def scandir(*args, **kwargs):
+        calls['listdir'] += 1
+        return CountingScandir(real['scandir'](*args, **kwargs), calls)
+
+    os.stat, os.lstat = counted_stat('stat'), counted_stat('lstat')
+    os.listdir, os.scandir = listdir, scandir
+    try:
+        yield calls
+    finally:
+        for name, function in real.items():
+            setattr(os, name, function)
+
+def walk_pathlib(platform_root):
+    """The previous stats_generator walk: iterdir + is_file + two stats per file + glob"""
+    for platform_path in platform_root.iterdir():
+        if not platform_path.is_dir():
+            continue
+        for problem_dir in platform_path.iterdir():
+            if not problem_dir.is_dir():
+                continue
+            for file_path in problem_dir.iterdir():
+                if file_path.is_file():
+                    file_path.stat().st_size
+                    file_path.stat().st_mtime
+            [f for f in problem_dir.glob('solution.*') if f.suffix in LANGUAGES]
+
+def walk_scandir(platform_root):
+    """The same information through DirectoryListing"""
+    for platform_path in DirectoryListing(platform_root).subdirs:
+        for problem_dir in DirectoryListing(platform_path).subdirs:
+            DirectoryListing(problem_dir)
+
+def benchmark(problems):
+    """Time both walks on a synthetic tree and count the filesystem calls each actually makes"""
+    tmp = Path(tempfile.mkdtemp(prefix='cp-walk-'))
+    try:
+        print(f"🏗️  Building synthetic tree with {problems} problems in {tmp}...")
+        build_synthetic_tree(tmp, problems)
+        platform_root = tmp / 'platform'
+
+        # Warm the dentry/inode caches so both walks see the same state
+        walk_scandir(platform_root)
+
+        results = {}
+        for name, walk in (('iterdir + stat', walk_pathlib), ('scandir', walk_scandir)):
+            # Untimed counting pass, then a timed pass without the wrappers' overhead
+            with count_fs_calls() as calls:
+                walk(platform_root)
+            start_time = time.perf_counter()
+            walk(platform_root)
+            results[name] = (time.perf_counter() - start_time, calls)
+
+        print(f"\n{'Walker':<16} {'Time':>9} {'stat calls':>12} {'listings':>10}")
+        for name, (elapsed, calls) in results.items():
+            print(f"{name:<16} {elapsed:>8.2f}s {calls['stat']:>12,} {calls['listdir']:>10,}")
+
+        old_time, old_calls = results['iterdir + stat']
+        new_time, new_calls = results['scandir']
+        print(f"\n⚡ {old_time / new_time:.1f}x faster, "
+              f"{old_calls['stat'] / max(new_calls['stat'], 1):.1f}x fewer stat calls")
+    finally:
+        shutil.rmtree(tmp)
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-pass directory walker for the problem archive')
+    parser.add_argument('--benchmark', type=int, metavar='PROBLEMS', help='Compare against the pathlib walk on a synthetic tree')
+
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.print_help()
+        sys.exit(1)
+    benchmark(args.benchmark)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Fork Server for Python Solutions
+Keeps a pre-initialized interpreter with the solution already compiled, and forks
+it once per test case. Each child gets its stdin/stdout/stderr redirected to files
+and runs the solution as __main__, so measured time excludes interpreter startup
+and module imports.
+
+The tester talks to the server over its stdin/stdout, one JSON object per line:
+    -> {"input": path, "stdout": path, "stderr": path, "timeout": seconds}
+    <- {"returncode": int, "user_time": float, "sys_time": float,
+        "memory_kb": int, "wall_time": float, "timed_out": bool, "cancelled": bool}
+
+Sending SIGUSR1 to the server kills the child it is currently running.
+
+Usage (normally started by test_solution.py):
+    python3 scripts/fork_server.py path/to/solution.py
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import threading
+import tempfile
+import traceback
+import subprocess
+from pathlib import Path
+
+# Modules most solutions import; loading them here keeps them out of the timed region
+PRELOAD_MODULES = [
+    'math', 'collections', 'heapq', 'bisect', 'itertools', 'functools',
+    'operator', 'string', 're', 'random', 'io', 'array', 'fractions', 'decimal'
+]
+
+def run_child(code, solution_path, request):
+    """Body of a forked child: redirect stdio, run the solution, never return"""
+    exit_code = 0
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+
+        in_fd = os.open(request['input'], os.O_RDONLY)
+        out_fd = os.open(request['stdout'], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        err_fd = os.open(request['stderr'], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(in_fd, 0)
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        for fd in (in_fd, out_fd, err_fd):
+            os.close(fd)
+
+        sys.stdin = sys.__stdin__ = open(0, 'r', closefd=False)
+        sys.stdout = sys.__stdout__ = open(1, 'w', closefd=False)
+        sys.stderr = sys.__stderr__ = open(2, 'w', closefd=False)
+        sys.argv = [str(solution_path)]
+
+        exec(code, {'__name__': '__main__', '__file__': str(solution_path), '__builtins__': __builtins__})
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        # Join non-daemon threads as interpreter shutdown would; solutions often
+        # run main() in a thread with a bigger stack (threading.stack_size)
+        try:
+            threading._shutdown()
+        except BaseException:
+            traceback.print_exc()
+            exit_code = exit_code or 1
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            exit_code = exit_code or 1
+        os._exit(exit_code)
+
+def serve(solution_path):
+    """Main loop of the server process"""
+    solution_path = Path(solution_path).resolve()
+
+    for module in PRELOAD_MODULES:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+    # Keep the protocol channel away from fds 0/1, which children overwrite
+    channel_in = os.fdopen(os.dup(0), 'r')
+    channel_out = os.fdopen(os.dup(1), 'w')
+
+    sys.path.insert(0, str(solution_path.parent))
+    try:
+        code = compile(solution_path.read_bytes(), str(solution_path), 'exec')
+    except (SyntaxError, ValueError, OSError) as e:
+        channel_out.write(json.dumps({"ready": False, "error": str(e)}) + "\n")
+        channel_out.flush()
+        return
+
+    child_pid = None
+    timed_out = False
+    cancelled = False
+    def kill_child():
+        # The child may already be reaped by wait4 while child_pid is still set
+        if child_pid:
+            try:
+                os.kill(child_pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    def on_alarm(signum, frame):
+        nonlocal timed_out
+        timed_out = True
+        kill_child()
+    def on_cancel(signum, frame):
+        # SIGUSR1 from the tester (fail-fast): kill the running child, if any
+        nonlocal cancelled
+        if child_pid:
+            cancelled = True
+            kill_child()
+    signal.signal(signal.SIGALRM, on_alarm)
+    signal.signal(signal.SIGUSR1, on_cancel)
+
+    channel_out.write(json.dumps({"ready": True}) + "\n")
+    channel_out.flush()
+
+    for line in channel_in:
+        request = json.loads(line)
+        timed_out = False
+        cancelled = False
+
+        start_time = time.perf_counter()
+        child_pid = os.fork()
+        if child_pid == 0:
+            channel_in.close()
+            channel_out.close()
+            run_child(code, solution_path, request)
+
+        signal.setitimer(signal.ITIMER_REAL, request.get('timeout', 5.0))
+        _, status, usage = os.wait4(child_pid, 0)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        wall_time = time.perf_counter() - start_time
+        child_pid = None
+
+        channel_out.write(json.dumps({
+            "returncode": os.waitstatus_to_exitcode(status),
+            "user_time": usage.ru_utime,
+            "sys_time": usage.ru_stime,
+            "memory_kb": usage.ru_maxrss,
+            "wall_time": wall_time,
+            "timed_out": timed_out,
+            "cancelled": cancelled
+        }) + "\n")
+        channel_out.flush()
+
+class ForkServer:
+    """Client side of one fork server process"""
+
+    def __init__(self, solution_path, cwd):
+        self.proc = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), str(solution_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=str(cwd)
+        )
+        ready = self.proc.stdout.readline()
+        if not ready or not json.loads(ready).get("ready"):
+            self.close()
+            raise RuntimeError(f"fork server failed to start for {solution_path}")
+
+    def run(self, input_file, stdout_file, stderr_file, timeout):
+        self.proc.stdin.write(json.dumps({
+            "input": str(input_file),
+            "stdout": str(stdout_file),
+            "stderr": str(stderr_file),
+            "timeout": timeout
+        }) + "\n")
+        self.proc.stdin.flush()
+        response = self.proc.stdout.readline()
+        if not response:
+            raise RuntimeError("fork server exited unexpectedly")
+        return json.loads(response)
+
+    def cancel(self):
+        try:
+            self.proc.send_signal(signal.SIGUSR1)
+        except OSError:
+            pass
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.wait()
+
+class ForkServerPool:
+    """
+    Pool of fork servers for one solution, one per concurrent test case.
+    run() returns the same dict shape as SolutionTester.execute.
+    """
+
+    def __init__(self, solution_path, cwd, size):
+        self.solution_path = solution_path
+        self.cwd = cwd
+        self.size = size
+        self.idle = queue.Queue()
+        self.servers = []
+        self.lock = threading.Lock()
+        self.failed = False
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.failed:
+                raise RuntimeError("fork server unavailable")
+            if len(self.servers) < self.size:
+                try:
+                    server = ForkServer(self.solution_path, self.cwd)
+                except RuntimeError:
+                    self.failed = True
+                    raise
+                self.servers.append(server)
+                return server
+        return self.idle.get()
+
+    def run(self, input_data=None, input_file=None, output_path=None, timeout=5.0):
+        """Run one case; stdout is written to output_path if given, else returned"""
+        with tempfile.TemporaryDirectory(prefix="cp-fork-") as tmp:
+            tmp = Path(tmp)
+            if input_file is None:
+                input_file = tmp / "input.txt"
+                input_file.write_text(input_data or "")
+            stdout_path = Path(output_path) if output_path else tmp / "stdout.txt"
+
+            server = self.acquire()
+            try:
+                response = server.run(Path(input_file).resolve(), stdout_path.resolve(), tmp / "stderr.txt", timeout)
+            finally:
+                self.idle.put(server)
+
+            return {
+                "returncode": response["returncode"],
+                "stdout": stdout_path.read_text() if not output_path else None,
+                "stderr": (tmp / "stderr.txt").read_text(),
+                "timed_out": response["timed_out"],
+                "cancelled": response.get("cancelled", False),
+                "cpu_time": response["user_time"] + response["sys_time"],
+                "user_time": response["user_time"],
+                "sys_time": response["sys_time"],
+                "memory_kb": response["memory_kb"],
+                "wall_time": response["wall_time"]
+            }
+
+    def cancel(self):
+        for server in list(self.servers):
+            server.cancel()
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+        self.servers = []
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: fork_server.py <solution.py>", file=sys.stderr)
+        sys.exit(1)
+    serve(sys.argv[1])
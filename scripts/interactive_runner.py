@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Interactive Problem Runner
+Connects a solution and a local interactor through pipes. All traffic is relayed
+with non-blocking I/O so every query can be timed: how long the interactor takes to
+answer, and how long the solution takes to send its next query after an answer
+(slow values there usually mean missing flushes). Both sides get CPU and wall-clock
+limits. Both run under the spawn helper, so their CPU time and peak memory are their
+own and not inflated by this process's RSS.
+
+The interactor is started as `interactor <input_file>` when a test input exists and
+follows testlib exit codes: 0 = accepted, 1 = wrong answer, 2 = presentation error,
+3 = interactor failure.
+
+Usage:
+    python3 scripts/interactive_runner.py ./solution interactor.py --input test.txt
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import signal
+import selectors
+import subprocess
+import argparse
+
+from spawn_helper import CPU_LIMIT_ENV, helper_command, find_program, read_report, stop_process
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+READ_SIZE = 64 * 1024
+# Stderr kept per side; the rest is dropped
+STDERR_LIMIT = 64 * 1024
+
+def latency_stats(samples):
+    """Mean/max/count of a list of seconds, in milliseconds"""
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "max_ms": max(samples) * 1000
+    }
+
+class InteractiveRunner:
+    def __init__(self, solution_command, interactor_command, cwd=None, time_limit=5.0, wall_limit=None):
+        self.solution_command = list(solution_command)
+        self.interactor_command = list(interactor_command)
+        self.cwd = str(cwd) if cwd else None
+        self.time_limit = time_limit
+        self.wall_limit = wall_limit or max(time_limit * 2, time_limit + 1.0)
+
+    def cpu_limit(self):
+        """Seconds of CPU after which the kernel stops a runaway process"""
+        return int(self.time_limit) + 2
+
+    def start(self, command):
+        """
+        Start command with piped stdio. With wait4 it runs under the spawn helper, which
+        applies the CPU limit and reports rusage on a pipe (proc.report_fd, read by reap).
+        """
+        use_helper = hasattr(os, 'wait4')
+        report_read = report_write = None
+        env = None
+        if use_helper:
+            find_program(command[0], self.cwd)
+            report_read, report_write = os.pipe()
+            command = helper_command() + [str(report_write)] + list(command)
+            env = dict(os.environ, **{CPU_LIMIT_ENV: str(self.cpu_limit())})
+        try:
+            proc = subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE, cwd=self.cwd, env=env,
+                pass_fds=(report_write,) if use_helper else ()
+            )
+        except BaseException:
+            if use_helper:
+                os.close(report_read)
+            raise
+        finally:
+            if use_helper:
+                os.close(report_write)
+        proc.spawn_helper = use_helper
+        proc.report_fd = report_read
+
+        if not use_helper and resource is not None and hasattr(resource, 'prlimit'):
+            seconds = self.cpu_limit()
+            try:
+                resource.prlimit(proc.pid, resource.RLIMIT_CPU, (seconds, seconds + 1))
+            except (OSError, ValueError):
+                pass
+        return proc
+
+    def reap(self, proc, start_time):
+        """Wait for a process from start; returns (returncode, user_time, sys_time, memory_kb)"""
+        if proc.spawn_helper:
+            _, status, usage = os.wait4(proc.pid, 0)
+            return read_report(proc.report_fd, status, usage)
+        proc.wait()
+        return proc.returncode, time.perf_counter() - start_time, 0.0, None
+
+    def run(self, input_file=None):
+        """Run one interaction; returns a dict of both sides' results and query statistics"""
+        interactor_command = self.interactor_command + ([str(input_file)] if input_file else [])
+        start_time = time.perf_counter()
+
+        solution = self.start(self.solution_command)
+        try:
+            interactor = self.start(interactor_command)
+        except BaseException:
+            stop_process(solution)
+            self.reap(solution, start_time)
+            raise
+
+        sol_in, inter_in = solution.stdin.fileno(), interactor.stdin.fileno()
+        sol_out, inter_out = solution.stdout.fileno(), interactor.stdout.fileno()
+
+        # source fd -> (name, destination fd or None for stderr)
+        routes = {
+            sol_out: ("query", inter_in),
+            inter_out: ("response", sol_in),
+            solution.stderr.fileno(): ("solution_stderr", None),
+            interactor.stderr.fileno(): ("interactor_stderr", None),
+        }
+        sources = {inter_in: sol_out, sol_in: inter_out}
+        pipes = {sol_in: solution.stdin, inter_in: interactor.stdin}
+        pending = {sol_in: bytearray(), inter_in: bytearray()}
+        closed_sources = set()
+        stderr = {"solution_stderr": bytearray(), "interactor_stderr": bytearray()}
+
+        selector = selectors.DefaultSelector()
+        for fd in routes:
+            os.set_blocking(fd, False)
+            selector.register(fd, selectors.EVENT_READ)
+        for fd in pipes:
+            os.set_blocking(fd, False)
+
+        queries = 0
+        round_trips = 0
+        last_query_at = None
+        last_response_at = None
+        solution_latencies = []
+        interactor_latencies = []
+        timed_out = False
+
+        def close_destination(fd):
+            if fd not in pending:
+                return
+            del pending[fd]
+            try:
+                selector.unregister(fd)
+            except (KeyError, ValueError):
+                pass
+            try:
+                pipes[fd].close()
+            except OSError:
+                pass
+
+        def flush(fd):
+            """Write as much buffered data as the pipe accepts; close it once its source is done"""
+            buffer = pending.get(fd)
+            if buffer is None:
+                return
+            try:
+                while buffer:
+                    written = os.write(fd, buffer)
+                    del buffer[:written]
+            except BlockingIOError:
+                pass
+            except OSError:
+                # Reader went away; nothing more can be delivered
+                close_destination(fd)
+                return
+            if not buffer and sources[fd] in closed_sources:
+                close_destination(fd)
+                return
+            try:
+                if buffer:
+                    selector.register(fd, selectors.EVENT_WRITE)
+                else:
+                    selector.unregister(fd)
+            except (KeyError, ValueError):
+                pass
+
+        while len(closed_sources) < len(routes):
+            remaining = self.wall_limit - (time.perf_counter() - start_time)
+            if remaining <= 0:
+                timed_out = True
+                break
+
+            for key, events in selector.select(timeout=remaining):
+                fd = key.fd
+                if events & selectors.EVENT_WRITE:
+                    flush(fd)
+                    continue
+
+                name, destination = routes[fd]
+                try:
+                    data = os.read(fd, READ_SIZE)
+                except BlockingIOError:
+                    continue
+                now = time.perf_counter()
+
+                if not data:
+                    selector.unregister(fd)
+                    closed_sources.add(fd)
+                    if destination is not None:
+                        flush(destination)
+                    continue
+
+                if destination is None:
+                    buffer = stderr[name]
+                    buffer.extend(data[:max(0, STDERR_LIMIT - len(buffer))])
+                    continue
+
+                lines = data.count(b'\n')
+                if name == "query" and lines:
+                    queries += lines
+                    if last_response_at is not None:
+                        solution_latencies.append(now - last_response_at)
+                        last_response_at = None
+                    last_query_at = now
+                elif name == "response" and lines:
+                    if last_query_at is not None:
+                        round_trips += 1
+                        interactor_latencies.append(now - last_query_at)
+                        last_query_at = None
+                    last_response_at = now
+
+                if destination in pending:
+                    pending[destination].extend(data)
+                    flush(destination)
+
+        if timed_out:
+            for proc in (solution, interactor):
+                try:
+                    stop_process(proc)
+                except OSError:
+                    pass
+        for fd in list(pending):
+            close_destination(fd)
+
+        selector.close()
+        results = {}
+        for name, proc in (("solution", solution), ("interactor", interactor)):
+            proc.returncode, user_time, sys_time, memory_kb = self.reap(proc, start_time)
+            results[name] = {
+                "returncode": proc.returncode,
+                "user_time": user_time,
+                "sys_time": sys_time,
+                "cpu_time": user_time + sys_time,
+                "memory_kb": memory_kb
+            }
+            for pipe in (proc.stdin, proc.stdout, proc.stderr):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+
+        solution_cpu = results["solution"]["cpu_time"]
+        # A process killed by RLIMIT_CPU gets SIGXCPU (or SIGKILL at the hard limit)
+        cpu_killed = results["solution"]["returncode"] in (-signal.SIGXCPU, -signal.SIGKILL) \
+            if hasattr(signal, 'SIGXCPU') else False
+
+        return {
+            "returncode": results["solution"]["returncode"],
+            "interactor_returncode": results["interactor"]["returncode"],
+            "stderr": stderr["solution_stderr"].decode(errors='replace'),
+            "interactor_stderr": stderr["interactor_stderr"].decode(errors='replace'),
+            "timed_out": timed_out or cpu_killed,
+            "cpu_time": solution_cpu,
+            "user_time": results["solution"]["user_time"],
+            "sys_time": results["solution"]["sys_time"],
+            "interactor_cpu_time": results["interactor"]["cpu_time"],
+            "interactor_timed_out": results["interactor"]["cpu_time"] > self.time_limit,
+            "memory_kb": results["solution"]["memory_kb"],
+            "wall_time": time.perf_counter() - start_time,
+            "queries": queries,
+            "round_trips": round_trips,
+            "solution_latency": latency_stats(solution_latencies),
+            "interactor_latency": latency_stats(interactor_latencies)
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a solution against a local interactor')
+    parser.add_argument('solution', help='Solution command (quoted if it has arguments)')
+    parser.add_argument('interactor', help='Interactor command (quoted if it has arguments)')
+    parser.add_argument('--input', help='Test input passed to the interactor as its first argument')
+    parser.add_argument('--time-limit', type=float, default=5.0, help='CPU time limit in seconds')
+
+    args = parser.parse_args()
+
+    def command(text):
+        parts = shlex.split(text)
+        if parts and parts[0].endswith('.py'):
+            parts = [sys.executable] + parts
+        return parts
+
+    runner = InteractiveRunner(command(args.solution), command(args.interactor), time_limit=args.time_limit)
+    result = runner.run(args.input)
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["interactor_returncode"] == 0 and result["returncode"] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
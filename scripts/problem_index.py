@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Problem Index for Competitive Programming Solutions
+An SQLite copy of solutions.json (problems, files, tags) plus the latest
+test_results.json of every problem, indexed on platform, status and difficulty,
+so questions about the archive don't need the whole JSON document parsed.
+stats_generator.py --index rebuilds it; solutions.json stays the source of truth.
+
+Usage:
+    python3 scripts/problem_index.py rebuild
+    python3 scripts/problem_index.py query --platform Codeforces --tag graphs --unsolved --sort last_modified
+    python3 scripts/problem_index.py query --failing
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+
+INDEX_FILE = Path('solutions.db')
+
+SCHEMA = """
+CREATE TABLE problems (
+    id INTEGER PRIMARY KEY,
+    directory TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    platform TEXT NOT NULL COLLATE NOCASE,
+    problem_id TEXT,
+    difficulty TEXT COLLATE NOCASE,
+    status TEXT,
+    url TEXT,
+    languages TEXT,
+    date_created TEXT,
+    last_modified TEXT
+);
+CREATE TABLE files (
+    problem INTEGER NOT NULL REFERENCES problems(id),
+    name TEXT NOT NULL,
+    type TEXT,
+    size INTEGER,
+    last_modified TEXT
+);
+CREATE TABLE tags (
+    problem INTEGER NOT NULL REFERENCES problems(id),
+    tag TEXT NOT NULL COLLATE NOCASE
+);
+CREATE TABLE test_results (
+    problem INTEGER NOT NULL REFERENCES problems(id),
+    lang TEXT,
+    case_id INTEGER,
+    test TEXT,
+    status TEXT,
+    time REAL,
+    memory_kb INTEGER,
+    timestamp TEXT
+);
+CREATE INDEX problems_platform ON problems(platform);
+CREATE INDEX problems_status ON problems(status);
+CREATE INDEX problems_difficulty ON problems(difficulty);
+CREATE INDEX problems_last_modified ON problems(last_modified);
+CREATE INDEX files_problem ON files(problem);
+CREATE INDEX tags_problem ON tags(problem, tag);
+CREATE INDEX tags_tag ON tags(tag, problem);
+CREATE INDEX test_results_problem ON test_results(problem, status);
+"""
+
+# Sortable problem columns for query --sort
+SORT_COLUMNS = ['last_modified', 'date_created', 'name', 'platform', 'difficulty', 'status']
+# Test statuses that don't count as failures for query --failing
+PASSING_STATUSES = ('Accepted', 'Skipped')
+
+def load_test_results(directory):
+    """The problem's last test_results.json as (timestamp, results), or (None, [])"""
+    try:
+        with open(Path(directory) / 'test_results.json', 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None, []
+    return data.get('timestamp'), data.get('results', [])
+
+def build_index(problems, index_file=INDEX_FILE):
+    """Write a fresh index for problems (solutions.json "problems" entries) and swap it in"""
+    index_file = Path(index_file)
+    tmp_file = index_file.with_suffix('.tmp')
+    if tmp_file.exists():
+        tmp_file.unlink()
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            for problem in problems:
+                cursor = conn.execute(
+                    "INSERT INTO problems (directory, name, platform, problem_id, difficulty, status, url,"
+                    " languages, date_created, last_modified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (problem['directory'], problem['name'], problem['platform'], str(problem.get('problem_id', '')),
+                     problem.get('difficulty'), problem.get('status'), problem.get('url'),
+                     ','.join(problem.get('languages', [])), problem.get('date_created'), problem.get('last_modified')))
+                row = cursor.lastrowid
+
+                conn.executemany(
+                    "INSERT INTO files (problem, name, type, size, last_modified) VALUES (?, ?, ?, ?, ?)",
+                    [(row, f['name'], f.get('type'), f.get('size'), f.get('last_modified'))
+                     for f in problem.get('files', [])])
+                conn.executemany(
+                    "INSERT INTO tags (problem, tag) VALUES (?, ?)",
+                    [(row, tag) for tag in problem.get('tags', [])])
+
+                timestamp, results = load_test_results(problem['directory'])
+                conn.executemany(
+                    "INSERT INTO test_results (problem, lang, case_id, test, status, time, memory_kb, timestamp)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(row, r.get('lang'), r.get('case_id'), r.get('test'), r.get('status'),
+                      r.get('time'), r.get('memory_kb'), timestamp) for r in results])
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, index_file)
+    return len(problems)
+
+def query_problems(index_file=INDEX_FILE, platform=None, status=None, difficulty=None, tags=None,
+                   unsolved=False, failing=False, sort='last_modified', descending=True, limit=None):
+    """Problems matching every given filter, as dicts with their tags"""
+    clauses = []
+    params = []
+    if platform:
+        clauses.append("p.platform = ?")
+        params.append(platform)
+    if status:
+        clauses.append("p.status = ?")
+        params.append(status)
+    if difficulty:
+        clauses.append("p.difficulty = ?")
+        params.append(difficulty)
+    for tag in tags or []:
+        clauses.append("EXISTS (SELECT 1 FROM tags t WHERE t.problem = p.id AND t.tag = ?)")
+        params.append(tag)
+    if unsolved:
+        clauses.append("p.status != 'completed'")
+    if failing:
+        clauses.append("EXISTS (SELECT 1 FROM test_results r WHERE r.problem = p.id AND r.status NOT IN (?, ?))")
+        params.extend(PASSING_STATUSES)
+
+    sql = ("SELECT p.*, (SELECT group_concat(tag, ',') FROM tags t WHERE t.problem = p.id) AS tag_list"
+           " FROM problems p")
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # sort is checked against SORT_COLUMNS, so it is safe to interpolate
+    sql += f" ORDER BY p.{sort} {'DESC' if descending else 'ASC'}, p.directory"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = sqlite3.connect(f"file:{index_file}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    problems = []
+    for row in rows:
+        problem = dict(row)
+        problem['tags'] = problem.pop('tag_list').split(',') if row['tag_list'] else []
+        problem['languages'] = problem['languages'].split(',') if problem['languages'] else []
+        del problem['id']
+        problems.append(problem)
+    return problems
+
+def print_problems(problems):
+    if not problems:
+        print("No matching problems")
+        return
+    print(f"{'Problem':<40} {'Platform':<12} {'Difficulty':<10} {'Status':<12} {'Last modified':<19}")
+    for p in problems:
+        print(f"{p['name'][:40]:<40} {p['platform']:<12} {p['difficulty'] or '':<10} "
+              f"{p['status'] or '':<12} {(p['last_modified'] or '')[:19]:<19}")
+    print(f"\n{len(problems)} problem(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite index of solutions.json')
+    parser.add_argument('--db', default=str(INDEX_FILE), help=f'Index file (default: {INDEX_FILE})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild_parser = subparsers.add_parser('rebuild', help='Rebuild the index from solutions.json')
+    rebuild_parser.add_argument('--source', default='solutions.json', help='solutions.json to index')
+
+    query_parser = subparsers.add_parser('query', help='List problems matching filters')
+    query_parser.add_argument('--platform', help='Platform name (case-insensitive)')
+    query_parser.add_argument('--status', choices=['completed', 'in_progress', 'started', 'not_started'])
+    query_parser.add_argument('--difficulty', help='Easy, Medium, Hard or Unknown')
+    query_parser.add_argument('--tag', action='append', help='Required tag (repeatable)')
+    query_parser.add_argument('--unsolved', action='store_true', help='Only problems not yet completed')
+    query_parser.add_argument('--failing', action='store_true', help='Only problems whose last test run had a failure')
+    query_parser.add_argument('--sort', choices=SORT_COLUMNS, default='last_modified', help='Sort column (default: last_modified)')
+    query_parser.add_argument('--asc', action='store_true', help='Sort ascending (default: descending)')
+    query_parser.add_argument('--limit', type=int, help='Maximum rows')
+    query_parser.add_argument('--json', action='store_true', help='Print matches as JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        try:
+            with open(args.source, 'r') as f:
+                problems = json.load(f).get('problems', [])
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read {args.source}: {e}")
+            sys.exit(1)
+        count = build_index(problems, args.db)
+        print(f"✅ Indexed {count} problems into {args.db}")
+        return
+
+    if not Path(args.db).exists():
+        print(f"❌ Index {args.db} not found; run: python3 scripts/stats_generator.py --index")
+        sys.exit(1)
+
+    problems = query_problems(
+        args.db,
+        platform=args.platform,
+        status=args.status,
+        difficulty=args.difficulty,
+        tags=args.tag,
+        unsolved=args.unsolved,
+        failing=args.failing,
+        sort=args.sort,
+        descending=not args.asc,
+        limit=args.limit
+    )
+    if args.json:
+        print(json.dumps(problems, indent=2))
+    else:
+        print_problems(problems)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Run Cache for Competitive Programming Solutions
+Remembers what running an executable on an input produced, keyed by a hash of the
+executable (binary, or source plus interpreter version) and a hash of the input.
+An entry holds the output digest, an excerpt of the output, resource usage and
+the checker verdicts already computed against expected outputs, so re-testing an
+unchanged solution doesn't execute anything.
+
+Usage:
+    python3 scripts/run_cache.py --stats
+    python3 scripts/run_cache.py --clear
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+import argparse
+
+from compile_cache import SizeCappedCache, default_cache_dir
+
+# Default cache size cap (bytes); override with CP_RUN_CACHE_MAX_MB
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+# Stores between eviction passes (a pass scans the whole cache)
+EVICT_INTERVAL = 100
+
+class RunCache(SizeCappedCache):
+
+    def __init__(self, cache_dir=None, max_size=None):
+        super().__init__(cache_dir or default_cache_dir() / 'runs', max_size,
+                         'CP_RUN_CACHE_MAX_MB', DEFAULT_MAX_SIZE)
+        self.stores = 0
+        self.lock = threading.Lock()
+
+    def cache_key(self, artifact_digest, input_digest):
+        return hashlib.sha256(f"{artifact_digest}\0{input_digest}".encode()).hexdigest()
+
+    def entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def lookup(self, key):
+        """Return the cached entry for key (and mark it recently used), or None"""
+        entry = self.entry_path(key)
+        try:
+            with open(entry, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return data
+
+    def store(self, key, data):
+        """Write an entry atomically; every EVICT_INTERVAL stores, trim the cache to max_size"""
+        entry = self.entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_entry = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_entry, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_entry, entry)
+        with self.lock:
+            self.stores += 1
+            evict = self.stores % EVICT_INTERVAL == 1
+        if evict:
+            self.evict()
+
+    def clear(self):
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the shared run cache')
+    parser.add_argument('--stats', action='store_true', help='Show cache size and entry count')
+    parser.add_argument('--clear', action='store_true', help='Remove all cached runs')
+
+    args = parser.parse_args()
+
+    cache = RunCache()
+
+    if args.clear:
+        cache.clear()
+        print(f"🧹 Cleared run cache: {cache.cache_dir}")
+    else:
+        stats = cache.stats()
+        print(f"📦 Run cache: {cache.cache_dir}")
+        print(f"   Entries: {stats['entries']}")
+        print(f"   Size: {stats['size'] / 1024 / 1024:.1f} MB / {stats['max_size'] / 1024 / 1024:.0f} MB")
+
+if __name__ == "__main__":
+    main()
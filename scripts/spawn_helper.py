@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Spawn Helper for Resource Measurement
+A process started straight from the tester reports ru_maxrss of at least the
+tester's own RSS: the high-water mark of the address space it was forked from
+is carried over exec. The helper is a small process that forks and execs the
+solution, reaps it with wait4 and writes "returncode user_time sys_time maxrss_kb"
+to a file descriptor, so the peak memory is the solution's own (plus ~1 MB for
+the compiled helper, ~7 MB for the Python fallback below).
+
+SIGTERM to the helper SIGKILLs the solution, which is still reaped and reported.
+With SPAWN_HELPER_CPU_LIMIT=<seconds> in its environment the helper sets RLIMIT_CPU
+on the solution before exec (the variable itself is not passed on).
+
+Usage (normally started by test_solution.py):
+    python3 scripts/spawn_helper.py <report_fd> <command> [args...]
+"""
+
+import os
+import sys
+import shutil
+import signal
+import hashlib
+import threading
+import subprocess
+from pathlib import Path
+
+HELPER_SOURCE = r"""
+#include <errno.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+static volatile pid_t child = 0;
+
+static void on_term(int sig) {
+    (void)sig;
+    if (child > 0) kill(child, SIGKILL);
+}
+
+int main(int argc, char **argv) {
+    if (argc < 3) return 2;
+    int report_fd = atoi(argv[1]);
+
+    /* Hold SIGTERM until child is set, so a kill right after fork isn't lost */
+    sigset_t block, old;
+    sigemptyset(&block);
+    sigaddset(&block, SIGTERM);
+    sigprocmask(SIG_BLOCK, &block, &old);
+    struct sigaction action;
+    memset(&action, 0, sizeof action);
+    action.sa_handler = on_term;
+    sigaction(SIGTERM, &action, NULL);
+
+    pid_t pid = fork();
+    if (pid < 0) {
+        perror("fork");
+        return 2;
+    }
+    if (pid == 0) {
+        close(report_fd);
+        const char *cpu_limit = getenv("SPAWN_HELPER_CPU_LIMIT");
+        if (cpu_limit) {
+            struct rlimit limit;
+            limit.rlim_cur = strtoul(cpu_limit, NULL, 10);
+            limit.rlim_max = limit.rlim_cur + 1;
+            setrlimit(RLIMIT_CPU, &limit);
+            unsetenv("SPAWN_HELPER_CPU_LIMIT");
+        }
+        signal(SIGTERM, SIG_DFL);
+        sigprocmask(SIG_SETMASK, &old, NULL);
+        execvp(argv[2], argv + 2);
+        perror(argv[2]);
+        _exit(127);
+    }
+    child = pid;
+    sigprocmask(SIG_SETMASK, &old, NULL);
+
+    int status;
+    struct rusage usage;
+    while (wait4(pid, &status, 0, &usage) < 0) {
+        if (errno != EINTR) return 2;
+    }
+    int returncode = WIFSIGNALED(status) ? -WTERMSIG(status) : WEXITSTATUS(status);
+    dprintf(report_fd, "%d %ld.%06ld %ld.%06ld %ld\n", returncode,
+            (long)usage.ru_utime.tv_sec, (long)usage.ru_utime.tv_usec,
+            (long)usage.ru_stime.tv_sec, (long)usage.ru_stime.tv_usec,
+            (long)usage.ru_maxrss);
+    return 0;
+}
+"""
+
+CPU_LIMIT_ENV = 'SPAWN_HELPER_CPU_LIMIT'
+
+_helper_lock = threading.Lock()
+_helper_command = None
+
+def helper_command(compiler="g++"):
+    """Command prefix for the helper: the compiled one if it builds, else this script"""
+    global _helper_command
+    with _helper_lock:
+        if _helper_command is None:
+            _helper_command = build_helper(compiler) or [sys.executable, '-S', '-I', str(Path(__file__).resolve())]
+        return list(_helper_command)
+
+def build_helper(compiler):
+    """Compile HELPER_SOURCE once into the shared cache directory; None if that fails"""
+    # Imported here: the Python fallback runs isolated (-I) and needs only the stdlib
+    from compile_cache import default_cache_dir, compiler_version
+    digest = hashlib.sha256(f"{HELPER_SOURCE}\0{compiler_version(compiler)}".encode()).hexdigest()[:16]
+    binary = default_cache_dir() / f"spawn-helper-{digest}"
+    if binary.exists():
+        return [str(binary)]
+
+    try:
+        binary.parent.mkdir(parents=True, exist_ok=True)
+        tmp_binary = binary.with_name(f"{binary.name}.{os.getpid()}.tmp")
+        result = subprocess.run([compiler, '-O2', '-x', 'c', '-', '-o', str(tmp_binary)],
+                                input=HELPER_SOURCE, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        os.replace(tmp_binary, binary)
+    except OSError:
+        return None
+    return [str(binary)]
+
+def stop_process(proc):
+    """
+    Kill a process that may run under the spawn helper. Those are signalled directly,
+    since Popen.kill polls and can reap the helper under the caller's os.wait4;
+    the helper turns SIGTERM into SIGKILL for the solution it is measuring.
+    """
+    if not getattr(proc, 'spawn_helper', False):
+        proc.kill()
+        return
+    try:
+        os.kill(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+def find_program(program, cwd):
+    """Raise FileNotFoundError like Popen would, rather than letting the helper exit 127"""
+    program = str(program)
+    if os.sep in program:
+        found = os.access(Path(cwd or '.') / program, os.X_OK)
+    else:
+        found = shutil.which(program) is not None
+    if not found:
+        raise FileNotFoundError(2, "No such file or directory", program)
+
+def read_report(report_fd, status, usage):
+    """
+    (returncode, user_time, sys_time, maxrss_kb) of the solution from the helper's report
+    fd (closed here), given the helper's own wait4 status and rusage as the fallback
+    """
+    with os.fdopen(report_fd, 'r') as report:
+        fields = report.read().split()
+    if len(fields) == 4:
+        return int(fields[0]), float(fields[1]), float(fields[2]), int(fields[3])
+    # The helper died before reporting (e.g. killed before it could fork)
+    return os.waitstatus_to_exitcode(status), usage.ru_utime, usage.ru_stime, usage.ru_maxrss
+
+def main():
+    """Python fallback with the same protocol as HELPER_SOURCE"""
+    report_fd = int(sys.argv[1])
+    command = sys.argv[2:]
+
+    child = None
+    def on_term(signum, frame):
+        if child:
+            os.kill(child, signal.SIGKILL)
+
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+    signal.signal(signal.SIGTERM, on_term)
+
+    child = os.fork()
+    if child == 0:
+        try:
+            os.close(report_fd)
+            cpu_limit = os.environ.pop(CPU_LIMIT_ENV, None)
+            if cpu_limit:
+                import resource
+                resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_limit), int(cpu_limit) + 1))
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+            os.execvp(command[0], command)
+        except OSError as e:
+            print(f"{command[0]}: {e}", file=sys.stderr)
+        os._exit(127)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+
+    _, status, usage = os.wait4(child, 0)
+    with os.fdopen(report_fd, 'w') as report:
+        report.write(f"{os.waitstatus_to_exitcode(status)} {usage.ru_utime} {usage.ru_stime} {usage.ru_maxrss}\n")
+
+if __name__ == "__main__":
+    main()
@@ -2,159 +2,307 @@
 """
 Stats Generator for Competitive Programming Solutions
 Scans the platform directory and updates solutions.json with current statistics
+(and, with --index, the SQLite index queried by problem_index.py)
 """
 
 import json
 import os
+import hashlib
 from pathlib import Path
 from datetime import datetime
+from functools import reduce, lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import re
+import argparse
 
-def scan_problem_directory(platform_path):
-    """Scan a platform directory for problems and extract metadata"""
+from dir_walker import DirectoryListing, LANGUAGES
+from problem_index import build_index, INDEX_FILE
+from compile_cache import default_cache_dir
+
+# Per-directory scan results, reused while no file in the directory changes
+SCAN_MANIFEST = Path('stats_manifest.json')
+SCAN_MANIFEST_VERSION = 1
+# Threads for the problem scan; the work is filesystem latency, not CPU
+SCAN_THREADS = int(os.environ.get('CP_SCAN_THREADS', 16))
+# Problem directories per task handed to the scan pool
+SCAN_CHUNK = 32
+# Problems listed under recent_activity
+RECENT_ACTIVITY = 10
+# Meaningful line counts of solution sources, keyed by content and template hash
+STATUS_CACHE = default_cache_dir() / 'status.json'
+STATUS_CACHE_LIMIT = 50000
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+# Solution suffix -> template it was created from
+TEMPLATE_FILES = {'.py': 'template.py', '.cpp': 'template.cpp'}
+# Lines that never count as progress, in any language
+BOILERPLATE = [
+    r'',
+    r'(?:#|//|/\*|\*|""").*',
+    r'(?i:.*(?:implementation here|todo|\bpass\b|# test cases).*)'
+]
+
+def load_scan_manifest():
+    """directory -> {"files": {name: [mtime_ns, size]}, "problem": problem_info}"""
+    if not SCAN_MANIFEST.exists():
+        return {}
+    try:
+        with open(SCAN_MANIFEST, 'r') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"⚠️  Could not read {SCAN_MANIFEST}, rescanning everything: {e}")
+        return {}
+    if data.get('version') != SCAN_MANIFEST_VERSION:
+        return {}
+    return data.get('directories', {})
+
+def save_scan_manifest(directories):
+    tmp_file = SCAN_MANIFEST.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump({'version': SCAN_MANIFEST_VERSION, 'directories': directories}, f)
+    os.replace(tmp_file, SCAN_MANIFEST)
+
+def scan_problem_directory(platform_path, manifest=None, scanned=None, counts=None, executor=None, status_cache=None):
+    """
+    Scan a platform directory for problems and extract metadata.
+    With a manifest (from load_scan_manifest), directories whose files all have the
+    same mtime and size as last time are taken from it; every scanned directory is
+    recorded in `scanned` and tallied in counts['reused'] / counts['rescanned'].
+    With an executor, chunks of SCAN_CHUNK directories are scanned concurrently;
+    problems always come back in directory name order. status_cache is passed on
+    to determine_status.
+    """
     problems = []
     platform_name = platform_path.name
-    
-    print(f"   Scanning path: {platform_path}")
+    manifest = manifest if manifest is not None else {}
+    scanned = scanned if scanned is not None else {}
+    counts = counts if counts is not None else {'reused': 0, 'rescanned': 0}
     
     try:
-        problem_dirs = [d for d in platform_path.iterdir() if d.is_dir()]
-        print(f"   Found {len(problem_dirs)} directories")
+        problem_dirs = sorted(DirectoryListing(platform_path).subdirs)
     except Exception as e:
         print(f"   ⚠️  Error reading directory {platform_path}: {e}")
         return problems
     
-    for problem_dir in problem_dirs:
-            
-        # Calculate relative directory path safely
+    chunks = [problem_dirs[i:i + SCAN_CHUNK] for i in range(0, len(problem_dirs), SCAN_CHUNK)]
+    scan_chunk = lambda chunk: [scan_directory(d, platform_name, manifest, status_cache) for d in chunk]
+    results = executor.map(scan_chunk, chunks) if executor else map(scan_chunk, chunks)
+    
+    # map() yields chunks in submission order, so the merge is deterministic
+    for chunk in results:
+        for directory_path, entry, reused in chunk:
+            scanned[directory_path] = entry
+            counts['reused' if reused else 'rescanned'] += 1
+            problems.append(entry['problem'])
+    
+    return problems
+
+def scan_directory(problem_dir, platform_name, manifest, status_cache=None):
+    """(directory_path, manifest entry, reused) for one problem directory"""
+    # Calculate relative directory path safely
+    try:
+        relative_path = problem_dir.relative_to(Path.cwd())
+        directory_path = str(relative_path)
+    except ValueError:
+        # Fallback if relative_to fails
+        directory_path = f"platform/{platform_name}/{problem_dir.name}"
+    
+    # One scandir pass gives the signature, languages and solution sources
+    listing = DirectoryListing(problem_dir)
+    signature = listing.files
+    previous = manifest.get(directory_path)
+    if previous and previous.get('files') == signature:
+        return directory_path, previous, True
+    
+    problem_info = scan_problem(problem_dir, platform_name, directory_path, listing, status_cache)
+    return directory_path, {'files': signature, 'problem': problem_info}, False
+
+def scan_platform(platform_path, manifest, executor=None, status_cache=None):
+    """Scan one platform: (problems, scanned manifest entries, counts, partial statistics)"""
+    scanned = {}
+    counts = {'reused': 0, 'rescanned': 0}
+    problems = scan_problem_directory(platform_path, manifest, scanned, counts, executor, status_cache)
+    return problems, scanned, counts, partial_statistics(problems)
+
+def mtime_isoformat(mtime_ns):
+    """
+    ISO timestamp of an st_mtime_ns, identical to datetime.fromtimestamp(st.st_mtime):
+    the float is built the way os.stat builds st_mtime, since mtime_ns / 1e9 can round
+    to a neighbouring microsecond and would rewrite every entry in solutions.json
+    """
+    seconds, nanoseconds = divmod(mtime_ns, 10**9)
+    return datetime.fromtimestamp(seconds + nanoseconds * 1e-9).isoformat()
+
+def scan_problem(problem_dir, platform_name, directory_path, listing, status_cache=None):
+    """Build the problem_info for one directory from its DirectoryListing (no further stats)"""
+    problem_info = {
+        'name': problem_dir.name,
+        'platform': platform_name,
+        'directory': directory_path,
+        'files': [],
+        'languages': [],
+        'difficulty': 'Unknown',
+        'status': 'Unknown',
+        'url': '',
+        'problem_id': '',
+        'tags': [],
+        'date_created': '',
+        'last_modified': ''
+    }
+    
+    # Read metadata.json if it exists
+    metadata_file = problem_dir / 'metadata.json'
+    has_metadata = 'metadata.json' in listing.files
+    if has_metadata:
         try:
-            relative_path = problem_dir.relative_to(Path.cwd())
-            directory_path = str(relative_path)
-        except ValueError:
-            # Fallback if relative_to fails
-            directory_path = f"platform/{platform_name}/{problem_dir.name}"
-        
-        problem_info = {
-            'name': problem_dir.name,
-            'platform': platform_name,
-            'directory': directory_path,
-            'files': [],
-            'languages': [],
-            'difficulty': 'Unknown',
-            'status': 'Unknown',
-            'url': '',
-            'problem_id': '',
-            'tags': [],
-            'date_created': '',
-            'last_modified': ''
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+                problem_info.update({
+                    'difficulty': metadata.get('difficulty', 'Unknown'),
+                    'status': metadata.get('status', 'Unknown'),
+                    'url': metadata.get('url', ''),
+                    'problem_id': metadata.get('id', ''),
+                    'tags': metadata.get('tags', []),
+                    'date_created': metadata.get('created', '')
+                })
+        except Exception as e:
+            print(f"⚠️  Warning: Could not read metadata for {problem_dir.name}: {e}")
+    
+    # Scan for solution files
+    solution_files = []
+    
+    for name, (mtime_ns, size) in listing.files.items():
+        file_path = problem_dir / name
+        file_info = {
+            'name': name,
+            'size': size,
+            'last_modified': mtime_isoformat(mtime_ns)
         }
         
-        # Read metadata.json if it exists
-        metadata_file = problem_dir / 'metadata.json'
-        if metadata_file.exists():
-            try:
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    problem_info.update({
-                        'difficulty': metadata.get('difficulty', 'Unknown'),
-                        'status': metadata.get('status', 'Unknown'),
-                        'url': metadata.get('url', ''),
-                        'problem_id': metadata.get('id', ''),
-                        'tags': metadata.get('tags', []),
-                        'date_created': metadata.get('created', '')
-                    })
-            except Exception as e:
-                print(f"⚠️  Warning: Could not read metadata for {problem_dir.name}: {e}")
-        
-        # Scan for solution files
-        solution_files = []
-        languages = set()
-        
-        for file_path in problem_dir.iterdir():
-            if file_path.is_file():
-                file_info = {
-                    'name': file_path.name,
-                    'size': file_path.stat().st_size,
-                    'last_modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-                }
-                
-                # Determine language and if it's a solution file
-                if file_path.suffix == '.py':
-                    languages.add('Python')
-                    if 'solution' in file_path.stem.lower():
-                        file_info['type'] = 'solution'
-                elif file_path.suffix == '.cpp':
-                    languages.add('C++')
-                    if 'solution' in file_path.stem.lower():
-                        file_info['type'] = 'solution'
-                elif file_path.suffix == '.java':
-                    languages.add('Java')
-                    if 'solution' in file_path.stem.lower():
-                        file_info['type'] = 'solution'
-                elif file_path.suffix == '.js':
-                    languages.add('JavaScript')
-                    if 'solution' in file_path.stem.lower():
-                        file_info['type'] = 'solution'
-                elif file_path.name == 'README.md':
-                    file_info['type'] = 'documentation'
-                elif file_path.name == 'metadata.json':
-                    file_info['type'] = 'metadata'
-                elif file_path.name == 'test_cases.json':
-                    file_info['type'] = 'test_cases'
-                else:
-                    file_info['type'] = 'other'
-                
-                solution_files.append(file_info)
-                
-                # Update last modified time for the problem
-                if not problem_info['last_modified'] or file_info['last_modified'] > problem_info['last_modified']:
-                    problem_info['last_modified'] = file_info['last_modified']
-        
-        problem_info['files'] = solution_files
-        problem_info['languages'] = list(languages)
+        # Determine if it's a solution file (languages come from the listing)
+        if file_path.suffix in LANGUAGES:
+            if 'solution' in file_path.stem.lower():
+                file_info['type'] = 'solution'
+        elif file_path.name == 'README.md':
+            file_info['type'] = 'documentation'
+        elif file_path.name == 'metadata.json':
+            file_info['type'] = 'metadata'
+        elif file_path.name == 'test_cases.json':
+            file_info['type'] = 'test_cases'
+        else:
+            file_info['type'] = 'other'
         
-        # Try to determine status based on file content
-        if not metadata_file.exists() or problem_info['status'] == 'Unknown':
-            problem_info['status'] = determine_status(problem_dir)
+        solution_files.append(file_info)
         
-        problems.append(problem_info)
+        # Update last modified time for the problem
+        if not problem_info['last_modified'] or file_info['last_modified'] > problem_info['last_modified']:
+            problem_info['last_modified'] = file_info['last_modified']
     
-    return problems
+    problem_info['files'] = solution_files
+    problem_info['languages'] = sorted(listing.languages)
+    
+    # Try to determine status based on file content
+    if not has_metadata or problem_info['status'] == 'Unknown':
+        problem_info['status'] = determine_status(problem_dir, listing.solution_files, status_cache)
+    
+    return problem_info
+
+def load_status_cache():
+    """digest -> meaningful line count, from earlier scans"""
+    try:
+        with open(STATUS_CACHE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_status_cache(cache):
+    """Write the cache back, keeping the STATUS_CACHE_LIMIT most recently used entries"""
+    cache = dict(list(cache.items())[-STATUS_CACHE_LIMIT:])
+    try:
+        STATUS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = STATUS_CACHE.with_name(f"{STATUS_CACHE.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, STATUS_CACHE)
+    except OSError as e:
+        print(f"⚠️  Could not save status cache {STATUS_CACHE}: {e}")
+
+def template_lines(suffix):
+    """Regex alternatives for the stripped lines of the template for suffix ({placeholders} match anything)"""
+    template_file = TEMPLATE_FILES.get(suffix)
+    try:
+        with open(TEMPLATES_DIR / template_file, 'r') as f:
+            template = f.read()
+    except (TypeError, OSError):
+        return []
+    
+    lines = []
+    for line in template.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        # Templates are str.format sources: {{ }} are literal braces, {name} a placeholder
+        parts = re.split(r'(\{\{|\}\}|\{\w+\})', line)
+        lines.append(''.join('.*' if re.fullmatch(r'\{\w+\}', part)
+                             else re.escape(part[0] if part in ('{{', '}}') else part)
+                             for part in parts))
+    return sorted(set(lines))
+
+@lru_cache(maxsize=None)
+def meaningful_line_regex(suffix):
+    """
+    (compiled regex, digest) where the regex matches, in one MULTILINE pass over a
+    source, every line that is neither boilerplate nor unchanged from the template
+    """
+    alternatives = BOILERPLATE + template_lines(suffix)
+    pattern = r'^(?!\s*(?:' + '|'.join(alternatives) + r')\s*$).*$'
+    return re.compile(pattern, re.MULTILINE), hashlib.sha256(pattern.encode()).hexdigest()
 
-def determine_status(problem_dir):
-    """Determine problem status based on file content analysis"""
-    solution_files = [f for f in problem_dir.glob('solution.*') if f.suffix in ['.py', '.cpp', '.java', '.js']]
+def meaningful_lines(solution_file, cache=None):
+    """Number of lines in solution_file that differ from its template, cached by content hash"""
+    with open(solution_file, 'rb') as f:
+        content = f.read()
+    regex, pattern_digest = meaningful_line_regex(Path(solution_file).suffix)
+    digest = hashlib.sha256(pattern_digest.encode() + content).hexdigest()
+    
+    if cache is not None:
+        # Re-insert on a hit: insertion order is use order, which save_status_cache trims by
+        count = cache.pop(digest, None)
+        if count is not None:
+            cache[digest] = count
+            return count
+    count = len(regex.findall(content.decode('utf-8', errors='replace')))
+    if cache is not None:
+        cache[digest] = count
+    return count
+
+def determine_status(problem_dir, solution_files=None, cache=None):
+    """
+    Determine problem status based on file content analysis.
+    solution_files (from DirectoryListing) saves globbing the directory again;
+    cache (digest -> line count, see load_status_cache) saves re-reading unchanged code.
+    """
+    if solution_files is None:
+        solution_files = DirectoryListing(problem_dir).solution_files
     
     if not solution_files:
         return 'not_started'
     
-    # Check if solutions have meaningful content
+    # The most complete solution decides
+    best = 0
     for solution_file in solution_files:
         try:
-            with open(solution_file, 'r') as f:
-                content = f.read()
-                
-            # Remove comments and whitespace
-            lines = [line.strip() for line in content.split('\n') 
-                    if line.strip() and not line.strip().startswith(('#', '//', '/*', '*', '"""'))]
-            
-            # Count non-template lines
-            meaningful_lines = [line for line in lines 
-                              if not any(template_word in line.lower() 
-                                       for template_word in ['implementation here', 'todo', 'pass', '# test cases'])]
-            
-            if len(meaningful_lines) > 10:  # Arbitrary threshold
-                return 'completed'
-            elif len(meaningful_lines) > 5:
-                return 'in_progress'
-                
-        except Exception:
+            best = max(best, meaningful_lines(solution_file, cache))
+        except OSError:
             continue
     
+    if best > 10:  # Arbitrary threshold
+        return 'completed'
+    elif best > 5:
+        return 'in_progress'
     return 'started'
 
-def calculate_statistics(problems):
-    """Calculate overall statistics from problems list"""
+def partial_statistics(problems):
+    """Statistics for a subset of problems (the map step; see merge_statistics)"""
     stats = {
         'total_problems': len(problems),
         'platforms': {},
@@ -204,7 +352,7 @@ def calculate_statistics(problems):
     # Get recent activity (last 10 modified problems)
     recent_problems = sorted(problems, 
                            key=lambda p: p.get('last_modified', ''), 
-                           reverse=True)[:10]
+                           reverse=True)[:RECENT_ACTIVITY]
     
     stats['recent_activity'] = [{
         'name': p['name'],
@@ -215,6 +363,33 @@ def calculate_statistics(problems):
     
     return stats
 
+def merge_statistics(left, right):
+    """
+    Combine two partial statistics (the reduce step). Counts add up, key order
+    follows left then right, and recent activity keeps the overall top entries;
+    the sort is stable, so ties resolve the same way as one pass over all problems.
+    """
+    merged = {'total_problems': left['total_problems'] + right['total_problems']}
+    for key in ('platforms', 'difficulty_distribution', 'language_distribution', 'status_distribution'):
+        counts = dict(left[key])
+        for name, count in right[key].items():
+            counts[name] = counts.get(name, 0) + count
+        merged[key] = counts
+    merged['recent_activity'] = sorted(left['recent_activity'] + right['recent_activity'],
+                                       key=lambda p: p['last_modified'],
+                                       reverse=True)[:RECENT_ACTIVITY]
+    return merged
+
+def calculate_statistics(problems, partials=None):
+    """
+    Calculate overall statistics from problems list.
+    partials (per-platform partial_statistics, in problem order) are reduced
+    instead of recounting every problem.
+    """
+    if partials is None:
+        partials = [partial_statistics(problems)]
+    return reduce(merge_statistics, partials, partial_statistics([]))
+
 def update_solutions_json(problems, stats):
     """Update solutions.json with current problems and statistics"""
     solutions_data = {
@@ -238,6 +413,11 @@ def update_solutions_json(problems, stats):
 
 def main():
     """Main function to scan directories and update statistics"""
+    parser = argparse.ArgumentParser(description='Scan platform directories and update solutions.json')
+    parser.add_argument('--index', action='store_true', help=f'Also rebuild the SQLite problem index ({INDEX_FILE})')
+    
+    args = parser.parse_args()
+    
     print("🔍 Scanning platform directories for problems...")
     print(f"📍 Current directory: {Path.cwd()}")
     
@@ -250,18 +430,38 @@ def main():
     print(f"📁 Platform directory: {platform_dir.absolute()}")
     all_problems = []
     
-    # Scan each platform directory
-    for platform_path in platform_dir.iterdir():
-        if platform_path.is_dir():
+    manifest = load_scan_manifest()
+    status_cache = load_status_cache()
+    scanned = {}
+    counts = {'reused': 0, 'rescanned': 0}
+    partials = []
+    
+    # Scan each platform directory; platforms run side by side and share one
+    # pool for their problem chunks, but results are collected in name order
+    platforms = sorted(DirectoryListing(platform_dir).subdirs)
+    with ThreadPoolExecutor(max_workers=SCAN_THREADS) as problem_pool, \
+         ThreadPoolExecutor(max_workers=max(len(platforms), 1)) as platform_pool:
+        futures = [(platform_path, platform_pool.submit(scan_platform, platform_path, manifest, problem_pool, status_cache))
+                   for platform_path in platforms]
+        for platform_path, future in futures:
             print(f"📁 Scanning {platform_path.name}...")
             try:
-                platform_problems = scan_problem_directory(platform_path)
+                platform_problems, platform_scanned, platform_counts, partial = future.result()
                 all_problems.extend(platform_problems)
+                scanned.update(platform_scanned)
+                for key, count in platform_counts.items():
+                    counts[key] += count
+                partials.append(partial)
                 print(f"   ✅ Found {len(platform_problems)} problems")
             except Exception as e:
                 print(f"   ❌ Error scanning {platform_path.name}: {e}")
                 continue
     
+    # Only directories seen in this run are kept, so deleted problems drop out
+    save_scan_manifest(scanned)
+    save_status_cache(status_cache)
+    print(f"♻️  Reused {counts['reused']} unchanged directories, rescanned {counts['rescanned']}")
+    
     if not all_problems:
         print("⚠️  No problems found. Have you set up any problems yet?")
         print("Run: python3 scripts/simple_setup.py LeetCode example-problem 1")
@@ -269,11 +469,15 @@ def main():
     
     # Calculate statistics
     print("📊 Calculating statistics...")
-    stats = calculate_statistics(all_problems)
+    stats = calculate_statistics(all_problems, partials)
     
     # Update solutions.json
     update_solutions_json(all_problems, stats)
     
+    if args.index:
+        build_index(all_problems)
+        print(f"✅ Rebuilt {INDEX_FILE} with {len(all_problems)} problems")
+    
     # Print summary
     print("\n📈 Statistics Summary:")
     print(f"   Total Problems: {stats['total_problems']}")
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Stress Tester for Competitive Programming Solutions
+Runs a random test generator, a brute-force reference and the solution on thousands
+of seeds across all cores, stopping every worker at the first divergence. The failing
+input and both outputs are appended to the problem's test_cases.json.
+
+The generator is called as `gen <seed>` and must print one test to stdout.
+Programs may be .cpp (compiled with the same flags and cache as test_solution.py)
+or .py files.
+
+Usage:
+    python3 scripts/stress_test.py <problem_dir> gen.py brute.cpp [--solution solution.cpp]
+    ./scripts/cp stress <problem_dir> gen.py brute.cpp
+"""
+
+import os
+import sys
+import json
+import subprocess
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import argparse
+
+from compile_cache import CompileCache, PrecompiledHeader
+from checkers import CHECKERS, get_checker
+from test_solution import CPP_COMPILER, CPP_FLAGS, prepare_program
+
+# Set in each worker process by init_worker
+_stop_event = None
+
+def init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+def run_program(command, cwd, input_data, timeout):
+    """Run one program; returns (ok, stdout, error)"""
+    try:
+        result = subprocess.run(
+            command,
+            input=input_data,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=cwd
+        )
+    except subprocess.TimeoutExpired:
+        return False, "", f"timeout (>{timeout}s)"
+    if result.returncode != 0:
+        return False, result.stdout, f"exit code {result.returncode}: {result.stderr.strip()[-500:]}"
+    return True, result.stdout, None
+
+def stress_batch(commands, cwd, seeds, checker_name, checker_options, timeout):
+    """
+    Worker: try each seed until a divergence or the shared stop flag is set.
+    Returns (seeds_run, failure) where failure is None or a dict describing it.
+    """
+    checker = get_checker(checker_name, **checker_options)
+    seeds_run = 0
+
+    for seed in seeds:
+        if _stop_event is not None and _stop_event.is_set():
+            break
+        seeds_run += 1
+
+        ok, test_input, error = run_program(commands['generator'] + [str(seed)], cwd, None, timeout)
+        if not ok:
+            return seeds_run, {"seed": seed, "reason": f"generator failed: {error}"}
+
+        brute_ok, brute_output, brute_error = run_program(commands['brute'], cwd, test_input, timeout)
+        if not brute_ok:
+            return seeds_run, {"seed": seed, "reason": f"brute force failed: {brute_error}", "input": test_input}
+
+        sol_ok, sol_output, sol_error = run_program(commands['solution'], cwd, test_input, timeout)
+        if not sol_ok:
+            reason = f"solution failed: {sol_error}"
+        else:
+            matches, message = checker.check(sol_output, brute_output)
+            if matches:
+                continue
+            reason = f"wrong answer at {message}"
+
+        return seeds_run, {
+            "seed": seed,
+            "reason": reason,
+            "input": test_input,
+            "expected_output": brute_output,
+            "solution_output": sol_output
+        }
+
+    return seeds_run, None
+
+class StressTester:
+    def __init__(self, problem_path, generator, brute, solution=None, use_compile_cache=True):
+        self.problem_dir = Path(problem_path).resolve()
+        self.compile_cache = CompileCache() if use_compile_cache else None
+        self.pch = PrecompiledHeader(CPP_COMPILER, CPP_FLAGS)
+
+        if solution is None:
+            for name in ("solution.cpp", "solution.py"):
+                if (self.problem_dir / name).exists():
+                    solution = name
+                    break
+
+        self.programs = {
+            'generator': generator,
+            'brute': brute,
+            'solution': solution
+        }
+
+        print(f"💣 Stress testing problem in: {self.problem_dir}")
+
+    def prepare(self, role, program):
+        """Compile if needed and return the command line for a program"""
+        if program is None:
+            raise ValueError(f"No {role} program given")
+        return prepare_program(program, self.problem_dir, role, self.compile_cache, self.pch)
+
+    def run(self, seeds=1000, start_seed=1, workers=None, batch_size=20,
+            checker='token', abs_eps=None, rel_eps=None, timeout=5.0):
+        """Stress test over seeds [start_seed, start_seed + seeds); returns the failure or None"""
+        try:
+            commands = {role: self.prepare(role, program) for role, program in self.programs.items()}
+        except Exception as e:
+            print(f"❌ {e}")
+            return {"seed": None, "reason": str(e)}
+
+        workers = workers or os.cpu_count() or 1
+        checker_options = {"abs_eps": abs_eps, "rel_eps": rel_eps}
+        all_seeds = list(range(start_seed, start_seed + seeds))
+        batches = [all_seeds[i:i + batch_size] for i in range(0, len(all_seeds), batch_size)]
+
+        print(f"🚀 Running {seeds} seeds on {workers} workers...")
+
+        stop_event = multiprocessing.Event()
+        failures = []
+        seeds_run = 0
+        batches_done = 0
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(stop_event,)) as executor:
+            pending = {
+                executor.submit(stress_batch, commands, str(self.problem_dir), batch,
+                                checker, checker_options, timeout)
+                for batch in batches
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    batch_run, failure = future.result()
+                    seeds_run += batch_run
+                    batches_done += 1
+                    if failure:
+                        failures.append(failure)
+                if failures and not stop_event.is_set():
+                    # Stop in-flight batches and drop the queued ones
+                    stop_event.set()
+                    for future in pending:
+                        future.cancel()
+                if not failures and batches_done % 50 == 0:
+                    print(f"   ... {seeds_run} seeds passed")
+
+        if not failures:
+            print(f"✅ No divergence in {seeds_run} seeds")
+            return None
+
+        # Several workers may fail at once; report the smallest seed for reproducibility
+        failure = min(failures, key=lambda f: f["seed"])
+        print(f"❌ Divergence on seed {failure['seed']}: {failure['reason']}")
+        if "input" in failure:
+            print(f"Input:\n{failure['input'].strip()}")
+        if "solution_output" in failure:
+            print(f"Brute force:\n{failure['expected_output'].strip()}")
+            print(f"Solution:\n{failure['solution_output'].strip()}")
+            self.save_counterexample(failure)
+        return failure
+
+    def save_counterexample(self, failure):
+        """Append the failing input and both outputs to test_cases.json"""
+        test_cases_path = self.problem_dir / "test_cases.json"
+        test_data = {"test_cases": []}
+        if test_cases_path.exists():
+            try:
+                with open(test_cases_path, 'r') as f:
+                    test_data = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Could not read {test_cases_path.name}, not saving: {e}")
+                return
+
+        cases = test_data.setdefault("test_cases", [])
+        next_id = max([c.get("id", 0) for c in cases if isinstance(c.get("id"), int)], default=0) + 1
+        cases.append({
+            "id": next_id,
+            "input": failure["input"].strip(),
+            "expected_output": failure["expected_output"].strip(),
+            "solution_output": failure["solution_output"].strip(),
+            "source": "stress",
+            "seed": failure["seed"]
+        })
+
+        with open(test_cases_path, 'w') as f:
+            json.dump(test_data, f, indent=2)
+
+        print(f"📝 Saved counterexample as test {next_id} in {test_cases_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress test a solution against a brute-force reference')
+    parser.add_argument('problem_path', help='Path to problem directory')
+    parser.add_argument('generator', help='Test generator (.py/.cpp), called as "gen <seed>"')
+    parser.add_argument('brute', help='Brute-force reference solution (.py/.cpp)')
+    parser.add_argument('--solution', help='Solution to check (default: solution.cpp, then solution.py)')
+    parser.add_argument('--seeds', type=int, default=1000, help='Number of seeds to try')
+    parser.add_argument('--start-seed', type=int, default=1, help='First seed')
+    parser.add_argument('-j', '--jobs', type=int, help='Worker processes (default: all CPUs)')
+    parser.add_argument('--timeout', type=float, default=5.0, help='Per-program timeout in seconds')
+    parser.add_argument('--checker', choices=list(CHECKERS), default='token', help='Output comparison mode')
+    parser.add_argument('--abs-eps', type=float, help='Absolute tolerance for the float checker')
+    parser.add_argument('--rel-eps', type=float, help='Relative tolerance for the float checker')
+    parser.add_argument('--no-compile-cache', action='store_true', help='Always invoke the compiler')
+
+    args = parser.parse_args()
+
+    tester = StressTester(
+        args.problem_path,
+        args.generator,
+        args.brute,
+        solution=args.solution,
+        use_compile_cache=not args.no_compile_cache
+    )
+    failure = tester.run(
+        seeds=args.seeds,
+        start_seed=args.start_seed,
+        workers=args.jobs,
+        checker=args.checker,
+        abs_eps=args.abs_eps,
+        rel_eps=args.rel_eps,
+        timeout=args.timeout
+    )
+    sys.exit(1 if failure else 0)
+
+if __name__ == "__main__":
+    main()
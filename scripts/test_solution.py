@@ -5,11 +5,108 @@ import sys
 import subprocess
 import time
 import json
+import math
+import shutil
+import hashlib
+import statistics
+import threading
+import tempfile
+from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 
+from compile_cache import CompileCache, PrecompiledHeader, compiler_version
+from run_cache import RunCache
+from fork_server import ForkServerPool
+from checkers import CHECKERS, get_checker, read_excerpt
+from interactive_runner import InteractiveRunner
+from spawn_helper import helper_command, find_program, read_report, stop_process
+
+# Verdicts that count as a failed test (used for fail-fast and history ordering)
+FAILURE_STATUSES = {"Wrong Answer", "Runtime Error", "Time Limit Exceeded", "Memory Limit Exceeded", "Error"}
+
+# Competitive programming compiler flags
+CPP_COMPILER = "g++"
+CPP_FLAGS = [
+    "-std=c++17",
+    "-O2",
+    "-Wall",
+    "-Wextra",
+    "-Wshadow",
+    "-DLOCAL",  # Define LOCAL for debug macros
+]
+
+def compile_cpp_source(source, executable, compile_cache=None, pch=None):
+    """
+    Compile a C++ source with the judge flags, through compile_cache when given and with
+    pch's precompiled <bits/stdc++.h> when given. Returns (success, cache_hit, stderr).
+    """
+    pch_flags = lambda: pch.flags_for(source) if pch else []
+    if compile_cache:
+        return compile_cache.compile(source, executable, CPP_COMPILER, CPP_FLAGS, extra_flags=pch_flags)
+    result = subprocess.run(
+        [CPP_COMPILER] + CPP_FLAGS + pch_flags() + ["-o", str(executable), str(source)],
+        capture_output=True,
+        text=True
+    )
+    return result.returncode == 0, False, result.stderr
+
+def prepare_program(program, problem_dir, role="program", compile_cache=None, pch=None):
+    """
+    Command line for a helper program (generator, brute force, interactor, ...) given as a
+    path or a name inside problem_dir: .py files run with python3, .cpp files are compiled
+    next to the source, anything else runs as is.
+    """
+    source = Path(program)
+    if not source.is_absolute() and not source.exists():
+        source = Path(problem_dir) / program
+    source = source.resolve()
+    if not source.exists():
+        raise FileNotFoundError(f"{role} not found: {source}")
+    
+    if source.suffix == '.py':
+        return ["python3", str(source)]
+    if source.suffix != '.cpp':
+        return [str(source)]
+    
+    executable = source.with_suffix('')
+    print(f"🔨 Compiling {role}: {source.name}")
+    success, _, stderr = compile_cpp_source(source, executable, compile_cache, pch)
+    if not success:
+        raise RuntimeError(f"Compilation of {source.name} failed:\n{stderr}")
+    return [str(executable)]
+
+def case_sort_key(case):
+    """Report order: test_cases.json cases by id (numeric ids first), then legacy file cases"""
+    case_id = case["id"]
+    numeric = isinstance(case_id, (int, float)) and not isinstance(case_id, bool)
+    return ("input_file" in case, not numeric, case_id if numeric else str(case_id))
+
+def file_digest(path, chunk_size=64 * 1024):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def timing_stats(times):
+    """min/median/p95 (nearest rank) and coefficient of variation of CPU times"""
+    times = sorted(times)
+    mean = statistics.mean(times)
+    return {
+        "runs": len(times),
+        "min": times[0],
+        "median": statistics.median(times),
+        "p95": times[max(0, math.ceil(0.95 * len(times)) - 1)],
+        "cv": statistics.pstdev(times) / mean if mean else 0.0
+    }
+
 class SolutionTester:
-    def __init__(self, problem_path):
+    def __init__(self, problem_path, use_compile_cache=True, use_pch=True, max_workers=None, cold_start=False,
+                 checker=None, abs_eps=None, rel_eps=None, fail_fast=False, use_history=True, repeat=1,
+                 use_run_cache=True):
         self.problem_dir = Path(problem_path)
         self.root_dir = self.problem_dir
         
@@ -21,8 +118,48 @@ class SolutionTester:
             if potential_path.exists():
                 self.problem_dir = potential_path
         
+        # Solutions run with cwd=problem_dir, so paths must not be relative
+        self.problem_dir = self.problem_dir.resolve()
+        
         print(f"🧪 Testing problem in: {self.problem_dir}")
         self.results = []
+        self.compile_errors = []
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        
+        # Python solutions run from a warm fork server unless cold_start is set
+        self.cold_start = cold_start or not hasattr(os, 'fork')
+        self.fork_pools = {}
+        
+        # Set for interactive problems (metadata "interactive": true)
+        self.interactor_command = None
+        
+        # With repeat > 1 every case runs that many times, interleaved across cases
+        self.repeat = max(1, repeat)
+        
+        # Fail-fast cancels queued and running cases after the first failure
+        self.fail_fast = fail_fast
+        self.use_history = use_history
+        self.history = {}
+        self.cancel_event = threading.Event()
+        self.running = set()
+        self.running_lock = threading.Lock()
+        
+        # Defaults when metadata.json has no limits
+        self.metadata = {}
+        self.time_limit = 5.0
+        self.memory_limit = None
+        
+        # Output checker; an explicit choice overrides metadata.json's "checker"
+        self.checker_name = checker
+        self.checker_options = {"abs_eps": abs_eps, "rel_eps": rel_eps}
+        self.checker = get_checker(checker or 'token', **self.checker_options)
+        self.compile_cache = CompileCache() if use_compile_cache else None
+        
+        # Unchanged executables on unchanged inputs are judged from the run cache;
+        # repeated runs exist to measure timing, so they always execute
+        self.run_cache = RunCache() if use_run_cache and self.repeat == 1 else None
+        self.artifact_digests = {}
+        self.pch = PrecompiledHeader(CPP_COMPILER, CPP_FLAGS) if use_pch else None
     
     def find_solution_files(self):
         """Find all solution files in the directory"""
@@ -45,28 +182,15 @@ class SolutionTester:
         """Compile C++ solution with competitive programming flags"""
         executable = self.problem_dir / "solution"
         
-        # Use competitive programming compiler flags
-        compile_cmd = [
-            "g++",
-            "-std=c++17",
-            "-O2",
-            "-Wall",
-            "-Wextra", 
-            "-Wshadow",
-            "-DLOCAL",  # Define LOCAL for debug macros
-            "-o", str(executable),
-            str(cpp_file)
-        ]
-        
         print(f"🔨 Compiling: {cpp_file.name}")
-        result = subprocess.run(compile_cmd, capture_output=True, text=True)
         
-        if result.returncode != 0:
+        success, cache_hit, stderr = compile_cpp_source(cpp_file, executable, self.compile_cache, self.pch)
+        if not success:
             print("❌ Compilation failed:")
-            print(result.stderr)
+            print(stderr)
             return None
         
-        print("✅ Compilation successful")
+        print("✅ Compilation skipped (cached binary)" if cache_hit else "✅ Compilation successful")
         return executable
     
     def compile_java(self, java_file):
@@ -87,132 +211,638 @@ class SolutionTester:
         print("✅ Java compilation successful")
         return self.problem_dir / "Solution.class"
     
-    def run_test_case(self, solution_file, lang, input_file, expected_file, test_name):
-        """Run a single test case"""
-        if not input_file.exists():
-            print(f"⚠️  Input file {input_file} not found, skipping {test_name}")
-            return
+    def prepare_program(self, program, role="program"):
+        """Command line for a helper program (generator, interactor, ...), compiling .cpp files"""
+        return prepare_program(program, self.problem_dir, role, self.compile_cache, self.pch)
+    
+    def find_interactor(self):
+        """Interactor for an interactive problem: metadata "interactor", else interactor.{cpp,py}"""
+        candidates = [self.metadata["interactor"]] if self.metadata.get("interactor") else []
+        candidates += ["interactor.cpp", "interactor.py", "interactor"]
+        for candidate in candidates:
+            if (self.problem_dir / candidate).exists():
+                return self.problem_dir / candidate
+        return None
+    
+    def load_test_cases(self):
+        """Load test_cases.json plus the legacy sample/input files as one ordered case list"""
+        cases = []
         
-        print(f"\n🧪 Running {test_name}...")
+        test_cases_file = self.problem_dir / "test_cases.json"
+        if test_cases_file.exists():
+            try:
+                with open(test_cases_file, 'r') as f:
+                    data = json.load(f)
+                for i, case in enumerate(data.get('test_cases', []), 1):
+                    case_id = case.get('id', i)
+                    cases.append({
+                        "id": case_id,
+                        "name": f"Test {case_id}",
+                        "input": case.get('input', ''),
+                        "expected_output": case.get('expected_output')
+                    })
+            except Exception as e:
+                print(f"⚠️  Could not read {test_cases_file.name}: {e}")
         
-        start_time = time.time()
+        # Legacy file-based tests
+        file_cases = [
+            ("sample_input.txt", "sample_output.txt", "Sample Test"),
+            ("input.txt", "expected.txt", "Custom Test"),
+            ("input.txt", None, "Input Test")  # Just run with input, no expected output
+        ]
+        next_id = max([c["id"] for c in cases if isinstance(c["id"], int)], default=0) + 1
+        for input_name, expected_name, test_name in file_cases:
+            input_file = self.problem_dir / input_name
+            if not input_file.exists():
+                continue
+            expected_file = self.problem_dir / expected_name if expected_name else None
+            if expected_name and not expected_file.exists():
+                continue
+            cases.append({
+                "id": next_id,
+                "name": test_name,
+                "input_file": input_file,
+                "expected_file": expected_file
+            })
+            next_id += 1
+        
+        return cases
+    
+    def build_command(self, solution_file, lang):
+        """Command line used to run a solution"""
+        if lang == 'cpp':
+            return [str(solution_file)]
+        elif lang == 'python':
+            return ["python3", str(solution_file)]
+        elif lang == 'java':
+            return ["java", "Solution"]
+        raise ValueError(f"Unsupported language: {lang}")
+    
+    def load_metadata(self):
+        """Read time/memory limits and checker settings from metadata.json"""
+        metadata_file = self.problem_dir / "metadata.json"
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f)
+                self.metadata = metadata
+                # Competitive Companion stores milliseconds and megabytes
+                if metadata.get('time_limit'):
+                    self.time_limit = metadata['time_limit'] / 1000.0
+                if metadata.get('memory_limit'):
+                    self.memory_limit = metadata['memory_limit']
+                if metadata.get('checker') and not self.checker_name:
+                    options = dict(self.checker_options)
+                    for key in ('abs_eps', 'rel_eps'):
+                        if options[key] is None and metadata.get(key) is not None:
+                            options[key] = metadata[key]
+                    self.checker = get_checker(metadata['checker'], **options)
+            except Exception as e:
+                print(f"⚠️  Could not read metadata.json: {e}")
         
+        memory = f"{self.memory_limit} MB" if self.memory_limit else "unlimited"
+        print(f"⏱️  Limits: {self.time_limit:.2f}s CPU, {memory} (checker: {self.checker.name})")
+    
+    def wall_timeout(self):
+        """Wall-clock budget before a child is killed (generous, CPU time decides TLE)"""
+        return max(self.time_limit * 2, self.time_limit + 1.0)
+    
+    def execute(self, command, input_data=None, input_file=None, output_path=None):
+        """
+        Run command under the spawn helper, which reaps it with wait4, so CPU time and peak
+        RSS belong to this run only (safe with parallel cases, unlike RUSAGE_CHILDREN deltas,
+        and not inflated by this process's own RSS).
+        If output_path is given stdout is written there instead of being captured.
+        Returns a dict with returncode, stdout, stderr, timed_out, cpu_time, user_time,
+        sys_time, memory_kb and wall_time.
+        """
+        stdin_file = open(input_file, 'r') if input_file else None
+        stdout_file = open(output_path, 'wb') if output_path else None
+        # With wait4 the command runs under the spawn helper, which reports the
+        # solution's own rusage (ru_maxrss of a direct child includes this process)
+        use_helper = hasattr(os, 'wait4')
+        report_read = report_write = None
+        if use_helper:
+            find_program(command[0], self.problem_dir)
+            report_read, report_write = os.pipe()
+            command = helper_command(CPP_COMPILER) + [str(report_write)] + list(command)
+        start_time = time.perf_counter()
         try:
-            with open(input_file, 'r') as f:
-                if lang == 'cpp':
-                    result = subprocess.run(
-                        [str(solution_file)],
-                        stdin=f,
-                        capture_output=True,
-                        text=True,
-                        timeout=5.0,
-                        cwd=str(self.problem_dir)
-                    )
-                elif lang == 'python':
-                    result = subprocess.run(
-                        ["python3", str(solution_file)],
-                        stdin=f,
-                        capture_output=True,
-                        text=True,
-                        timeout=5.0,
-                        cwd=str(self.problem_dir)
-                    )
-                elif lang == 'java':
-                    result = subprocess.run(
-                        ["java", "Solution"],
-                        stdin=f,
-                        capture_output=True,
-                        text=True,
-                        timeout=5.0,
-                        cwd=str(self.problem_dir)
-                    )
-            
-            execution_time = time.time() - start_time
-            
-            if result.returncode != 0:
-                print(f"❌ Runtime Error in {test_name}")
-                print(f"Error: {result.stderr}")
-                self.results.append({
-                    "test": test_name,
-                    "status": "Runtime Error",
-                    "time": execution_time,
-                    "error": result.stderr.strip()
-                })
-                return
-            
-            # Get actual output
-            actual_output = result.stdout.strip()
-            
-            # Compare with expected output if available
-            if expected_file and expected_file.exists():
-                with open(expected_file, 'r') as f:
-                    expected_output = f.read().strip()
-                
-                if actual_output == expected_output:
-                    print(f"✅ {test_name} PASSED ({execution_time:.3f}s)")
-                    self.results.append({
-                        "test": test_name,
-                        "status": "Accepted", 
-                        "time": execution_time
-                    })
-                else:
-                    print(f"❌ {test_name} WRONG ANSWER ({execution_time:.3f}s)")
-                    print(f"Expected:\n{expected_output}")
-                    print(f"Got:\n{actual_output}")
-                    self.results.append({
-                        "test": test_name,
-                        "status": "Wrong Answer",
-                        "time": execution_time,
-                        "expected": expected_output,
-                        "actual": actual_output
-                    })
-            else:
-                print(f"🔍 {test_name} OUTPUT ({execution_time:.3f}s):")
-                print(actual_output)
-                
-                # Save output for manual verification
-                output_file = self.problem_dir / "output.txt"
-                with open(output_file, 'w') as f:
-                    f.write(actual_output)
-                
-                self.results.append({
-                    "test": test_name,
-                    "status": "Output Generated",
-                    "time": execution_time,
-                    "output": actual_output
-                })
-        
-        except subprocess.TimeoutExpired:
-            print(f"⏰ {test_name} TIMEOUT (>5s)")
-            self.results.append({
-                "test": test_name,
-                "status": "Time Limit Exceeded",
-                "time": 5.0
+            proc = subprocess.Popen(
+                command,
+                stdin=stdin_file or subprocess.PIPE,
+                stdout=stdout_file or subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=str(self.problem_dir),
+                pass_fds=(report_write,) if use_helper else ()
+            )
+        except BaseException:
+            if use_helper:
+                os.close(report_read)
+            raise
+        finally:
+            if stdin_file:
+                stdin_file.close()
+            if stdout_file:
+                stdout_file.close()
+            if use_helper:
+                os.close(report_write)
+        proc.spawn_helper = use_helper
+        
+        timed_out = threading.Event()
+        def kill():
+            timed_out.set()
+            stop_process(proc)
+        timer = threading.Timer(self.wall_timeout(), kill)
+        timer.start()
+        
+        with self.running_lock:
+            self.running.add(proc)
+            if self.cancel_event.is_set():
+                stop_process(proc)
+        
+        output = {}
+        def drain(name, pipe):
+            output[name] = pipe.read()
+            pipe.close()
+        def feed():
+            try:
+                if input_data:
+                    proc.stdin.write(input_data)
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+        
+        threads = [threading.Thread(target=drain, args=("stderr", proc.stderr))]
+        if proc.stdout:
+            threads.append(threading.Thread(target=drain, args=("stdout", proc.stdout)))
+        if proc.stdin:
+            threads.append(threading.Thread(target=feed))
+        for thread in threads:
+            thread.start()
+        
+        if use_helper:
+            _, status, usage = os.wait4(proc.pid, 0)
+            wall_time = time.perf_counter() - start_time
+            # Kilobytes on Linux; only the helper's ~1 MB is inherited
+            proc.returncode, user_time, sys_time, memory_kb = read_report(report_read, status, usage)
+        else:
+            proc.wait()
+            wall_time = time.perf_counter() - start_time
+            user_time, sys_time, memory_kb = wall_time, 0.0, None
+        timer.cancel()
+        
+        with self.running_lock:
+            self.running.discard(proc)
+        
+        for thread in threads:
+            thread.join()
+        
+        return {
+            "returncode": proc.returncode,
+            "stdout": output.get("stdout", "") if not output_path else None,
+            "stderr": output.get("stderr", ""),
+            "timed_out": timed_out.is_set() and proc.returncode < 0,
+            "cancelled": self.cancel_event.is_set() and proc.returncode < 0,
+            "cpu_time": user_time + sys_time,
+            "user_time": user_time,
+            "sys_time": sys_time,
+            "memory_kb": memory_kb,
+            "wall_time": wall_time
+        }
+    
+    def run_test_case(self, solution_file, lang, case):
+        """Run a single test case and return a structured result (no printing, thread-safe)"""
+        test_name = f"{case['name']} ({lang})"
+        result_base = {"case_id": case["id"], "test": test_name, "lang": lang}
+        
+        if self.cancel_event.is_set():
+            return dict(result_base, status="Skipped")
+        
+        with tempfile.TemporaryDirectory(prefix="cp-test-") as tmp:
+            output_path = Path(tmp) / "output.txt"
+            try:
+                return self.judge_test_case(solution_file, lang, case, output_path, result_base)
+            except Exception as e:
+                return dict(result_base, status="Error", error=str(e))
+    
+    def artifact_digest(self, solution_file, lang):
+        """
+        Hash identifying what runs: the binary or class file, or the source plus interpreter
+        version and how it is started (a fork-server run has no interpreter startup in its time)
+        """
+        path = Path(solution_file)
+        stat = path.stat()
+        memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+        if memo_key not in self.artifact_digests:
+            runtime = {'python': 'python3', 'java': 'java'}.get(lang)
+            banner = compiler_version(runtime) if runtime else ''
+            mode = ('cold-start' if self.cold_start else 'fork-server') if lang == 'python' else ''
+            self.artifact_digests[memo_key] = hashlib.sha256(
+                f"{lang}\0{banner}\0{mode}\0{file_digest(path)}".encode()
+            ).hexdigest()
+        return self.artifact_digests[memo_key]
+    
+    def checker_digest(self, expected):
+        """Hash of the expected output together with the checker and its tolerances"""
+        if isinstance(expected, Path):
+            expected_digest = file_digest(expected)
+        else:
+            expected_digest = hashlib.sha256(expected.encode()).hexdigest()
+        options = sorted((k, v) for k, v in vars(self.checker).items())
+        return f"{self.checker.name}:{options}:{expected_digest}"
+    
+    def cached_run(self, solution_file, lang, case, expected):
+        """(cache key, check key, usable cache entry or None) for a case"""
+        if case.get("input_file"):
+            input_digest = file_digest(case["input_file"])
+        else:
+            input_digest = hashlib.sha256(case.get("input", "").encode()).hexdigest()
+        cache_key = self.run_cache.cache_key(self.artifact_digest(solution_file, lang), input_digest)
+        check_key = self.checker_digest(expected)
+        entry = self.run_cache.lookup(cache_key)
+        # A clean exit is only reusable once this expected output/checker pair has been judged
+        if entry and (entry["returncode"] != 0 or check_key in entry["checks"]):
+            return cache_key, check_key, entry
+        return cache_key, check_key, None
+    
+    def judge_test_case(self, solution_file, lang, case, output_path, result_base):
+        """Execute one case with stdout going to output_path and turn it into a verdict"""
+        if self.interactor_command:
+            return self.judge_interactive_case(solution_file, lang, case, output_path, result_base)
+        
+        expected = case.get("expected_file") or case.get("expected_output")
+        
+        # Cases without an expected output need the real output file, so they always run
+        cache_key = check_key = entry = None
+        if self.run_cache and expected is not None:
+            cache_key, check_key, entry = self.cached_run(solution_file, lang, case, expected)
+        if entry:
+            return self.judge_cached_run(entry, check_key, expected, result_base)
+        
+        run = None
+        fork_pool = self.fork_pools.get(solution_file)
+        if fork_pool:
+            try:
+                run = fork_pool.run(
+                    input_data=case.get("input"),
+                    input_file=case.get("input_file"),
+                    output_path=output_path,
+                    timeout=self.wall_timeout()
+                )
+            except RuntimeError:
+                # e.g. a syntax error kills the server; cold start reports it properly
+                run = None
+        if run is None:
+            run = self.execute(
+                self.build_command(solution_file, lang),
+                input_data=case.get("input"),
+                input_file=case.get("input_file"),
+                output_path=output_path
+            )
+        
+        if run.get("cancelled"):
+            return dict(result_base, status="Skipped")
+        
+        execution_time = run["cpu_time"]
+        result_base.update({
+            "time": execution_time,
+            "user_time": run["user_time"],
+            "sys_time": run["sys_time"],
+            "wall_time": run["wall_time"],
+            "memory_kb": run["memory_kb"]
+        })
+        
+        if run["timed_out"] or execution_time > self.time_limit:
+            return dict(result_base, status="Time Limit Exceeded")
+        
+        if self.memory_limit and run["memory_kb"] and run["memory_kb"] > self.memory_limit * 1024:
+            return dict(result_base, status="Memory Limit Exceeded")
+        
+        if run["returncode"] != 0:
+            if cache_key:
+                self.store_run(cache_key, run, output_path)
+            return dict(result_base, status="Runtime Error", error=run["stderr"].strip())
+        
+        if self.repeat > 1:
+            # Lets combine_runs spot nondeterministic output
+            result_base["output_hash"] = file_digest(output_path)
+        
+        # Compare with expected output if available, streaming both sides
+        if expected is not None:
+            ok, message = self.checker.check(output_path, expected)
+            if cache_key:
+                self.store_run(cache_key, run, output_path, {check_key: [ok, message]})
+            if ok:
+                return dict(result_base, status="Accepted")
+            return dict(result_base, **{
+                "status": "Wrong Answer",
+                "mismatch": message,
+                "expected": read_excerpt(expected).strip(),
+                "actual": read_excerpt(output_path).strip()
             })
+        
+        # Save output for manual verification
+        shutil.copyfile(output_path, self.problem_dir / "output.txt")
+        return dict(result_base, status="Output Generated", output=read_excerpt(output_path).strip())
+    
+    def store_run(self, cache_key, run, output_path, checks=None):
+        """Remember a finished run; verdicts for other expected outputs already cached are kept"""
+        previous = self.run_cache.lookup(cache_key)
+        all_checks = dict(previous["checks"]) if previous else {}
+        all_checks.update(checks or {})
+        self.run_cache.store(cache_key, {
+            "returncode": run["returncode"],
+            "stderr": run["stderr"][-4096:],
+            "cpu_time": run["cpu_time"],
+            "user_time": run["user_time"],
+            "sys_time": run["sys_time"],
+            "wall_time": run["wall_time"],
+            "memory_kb": run["memory_kb"],
+            "output_digest": file_digest(output_path),
+            "output_excerpt": read_excerpt(output_path).strip(),
+            "checks": all_checks
+        })
+    
+    def judge_cached_run(self, entry, check_key, expected, result_base):
+        """Verdict for a cached run, re-applying the current limits"""
+        result_base.update({
+            "time": entry["cpu_time"],
+            "user_time": entry["user_time"],
+            "sys_time": entry["sys_time"],
+            "wall_time": entry["wall_time"],
+            "memory_kb": entry["memory_kb"],
+            "cached": True
+        })
+        
+        if entry["cpu_time"] > self.time_limit:
+            return dict(result_base, status="Time Limit Exceeded")
+        if self.memory_limit and entry["memory_kb"] and entry["memory_kb"] > self.memory_limit * 1024:
+            return dict(result_base, status="Memory Limit Exceeded")
+        if entry["returncode"] != 0:
+            return dict(result_base, status="Runtime Error", error=entry["stderr"].strip())
+        
+        ok, message = entry["checks"][check_key]
+        if ok:
+            return dict(result_base, status="Accepted")
+        return dict(result_base, **{
+            "status": "Wrong Answer",
+            "mismatch": message,
+            "expected": read_excerpt(expected).strip(),
+            "actual": entry["output_excerpt"]
+        })
+    
+    def judge_interactive_case(self, solution_file, lang, case, input_path, result_base):
+        """Run one case against the interactor; the case input is handed to the interactor"""
+        input_file = case.get("input_file")
+        if input_file is None:
+            input_file = input_path
+            with open(input_file, 'w') as f:
+                f.write(case.get("input", ""))
+        
+        runner = InteractiveRunner(
+            self.build_command(solution_file, lang),
+            self.interactor_command,
+            cwd=self.problem_dir,
+            time_limit=self.time_limit,
+            wall_limit=self.wall_timeout()
+        )
+        run = runner.run(input_file)
+        
+        result_base.update({
+            "time": run["cpu_time"],
+            "user_time": run["user_time"],
+            "sys_time": run["sys_time"],
+            "wall_time": run["wall_time"],
+            "memory_kb": run["memory_kb"],
+            "queries": run["queries"],
+            "round_trips": run["round_trips"],
+            "solution_latency": run["solution_latency"],
+            "interactor_latency": run["interactor_latency"]
+        })
+        
+        if run["timed_out"] or run["cpu_time"] > self.time_limit:
+            return dict(result_base, status="Time Limit Exceeded")
+        if self.memory_limit and run["memory_kb"] and run["memory_kb"] > self.memory_limit * 1024:
+            return dict(result_base, status="Memory Limit Exceeded")
+        if run["interactor_timed_out"]:
+            return dict(result_base, status="Error", error="Interactor exceeded the time limit")
+        
+        # testlib exit codes: 0 OK, 1 WA, 2 PE, 3 interactor failure
+        interactor_code = run["interactor_returncode"]
+        if interactor_code in (1, 2):
+            message = run["interactor_stderr"].strip() or f"interactor exit code {interactor_code}"
+            return dict(result_base, status="Wrong Answer", mismatch=message, expected="", actual="")
+        if interactor_code != 0:
+            return dict(result_base, status="Error", error=f"Interactor failed ({interactor_code}): {run['interactor_stderr'].strip()}")
+        if run["returncode"] != 0:
+            return dict(result_base, status="Runtime Error", error=run["stderr"].strip())
+        return dict(result_base, status="Accepted")
+    
+    def load_history(self):
+        """Index the previous run's test_results.json by (lang, case_id)"""
+        self.history = {}
+        results_file = self.problem_dir / "test_results.json"
+        if not self.use_history or not results_file.exists():
+            return
+        try:
+            with open(results_file, 'r') as f:
+                previous = json.load(f)
+            for result in previous.get("results", []):
+                if "case_id" in result and "lang" in result:
+                    self.history[(result["lang"], result["case_id"])] = result
         except Exception as e:
-            print(f"💥 {test_name} ERROR: {e}")
-            self.results.append({
-                "test": test_name,
-                "status": "Error",
-                "error": str(e)
-            })
+            print(f"⚠️  Could not read previous test results: {e}")
+    
+    def order_cases(self, lang, cases):
+        """
+        Execution order: cases that failed last time, then new cases, then the rest
+        slowest first. Reporting order is unaffected.
+        """
+        def priority(indexed_case):
+            index, case = indexed_case
+            previous = self.history.get((lang, case["id"]))
+            if previous is None or previous.get("status") == "Skipped":
+                return (1, 0.0, index)
+            failed = previous.get("status") in FAILURE_STATUSES
+            return (0 if failed else 2, -previous.get("time", 0.0), index)
+        
+        return sorted(enumerate(cases), key=priority)
+    
+    def cancel_running(self):
+        """Stop every in-flight case (fail-fast)"""
+        self.cancel_event.set()
+        with self.running_lock:
+            # Signal only; execute() reaps its own child, so never poll here
+            for proc in self.running:
+                try:
+                    stop_process(proc)
+                except OSError:
+                    pass
+        for fork_pool in self.fork_pools.values():
+            fork_pool.cancel()
+    
+    def run_test_cases(self, solution_file, lang, cases):
+        """
+        Run all cases through a bounded thread pool; results come back in case-id order.
+        With repeat > 1 the cases run round after round and each case's runs are combined.
+        """
+        ordered = self.order_cases(lang, cases)
+        tasks = [(index, case) for _ in range(self.repeat) for index, case in ordered]
+        results = {}
+        self.cancel_event.clear()
+        
+        def record(index, result):
+            results.setdefault(index, []).append(result)
+            if self.fail_fast and result["status"] in FAILURE_STATUSES and not self.cancel_event.is_set():
+                self.cancel_running()
+        
+        if self.max_workers <= 1 or len(tasks) <= 1:
+            for index, case in tasks:
+                if self.cancel_event.is_set():
+                    break
+                record(index, self.run_test_case(solution_file, lang, case))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+                futures = {
+                    executor.submit(self.run_test_case, solution_file, lang, case): index
+                    for index, case in tasks
+                }
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    record(futures[future], future.result())
+                    if self.cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+        
+        # Report in case-id order (legacy file cases last) so output is deterministic
+        return [
+            self.combine_runs(results[index]) if index in results else {
+                "case_id": case["id"],
+                "test": f"{case['name']} ({lang})",
+                "lang": lang,
+                "status": "Skipped"
+            }
+            for index, case in sorted(enumerate(cases), key=lambda item: case_sort_key(item[1]))
+        ]
+    
+    def combine_runs(self, runs):
+        """
+        Merge repeated runs of one case: the verdict is the first failing run's (else
+        the last run's), time is the median, and a case whose verdict or output
+        changes between runs is flagged as flaky.
+        """
+        if len(runs) == 1:
+            return runs[0]
+        
+        runs = [r for r in runs if r["status"] != "Skipped"] or runs
+        failed = [r for r in runs if r["status"] in FAILURE_STATUSES]
+        result = dict(failed[0] if failed else runs[-1])
+        result.pop("output_hash", None)
+        
+        verdicts = {}
+        for run in runs:
+            verdicts[run["status"]] = verdicts.get(run["status"], 0) + 1
+        result["verdicts"] = verdicts
+        
+        times = [r["time"] for r in runs if "time" in r]
+        if times:
+            result["timing"] = timing_stats(times)
+            result["time"] = result["timing"]["median"]
+        
+        reasons = []
+        if len(verdicts) > 1:
+            reasons.append("verdict changes between runs")
+        if len({r["output_hash"] for r in runs if "output_hash" in r}) > 1:
+            reasons.append("output changes between runs")
+        result["flaky"] = bool(reasons)
+        if reasons:
+            result["flaky_reasons"] = reasons
+        return result
+    
+    def format_usage(self, result):
+        """CPU time and peak memory of a result, e.g. '0.012s, 3.4 MB'"""
+        usage = f"{result.get('time', 0.0):.3f}s"
+        if result.get("memory_kb"):
+            usage += f", {result['memory_kb'] / 1024:.1f} MB"
+        if result.get("cached"):
+            usage += ", cached run"
+        return usage
+    
+    def report_result(self, result):
+        """Print a single test result"""
+        test_name = result["test"]
+        status = result["status"]
+        usage = self.format_usage(result)
+        
+        print(f"\n🧪 Running {test_name}...")
+        
+        if "timing" in result:
+            timing = result["timing"]
+            print(f"   {timing['runs']} runs: min {timing['min']:.3f}s, median {timing['median']:.3f}s, "
+                  f"p95 {timing['p95']:.3f}s, CV {timing['cv']*100:.1f}%")
+        if result.get("flaky"):
+            counts = ", ".join(f"{status}: {count}" for status, count in result["verdicts"].items())
+            print(f"🎲 {test_name} is FLAKY: {'; '.join(result['flaky_reasons'])} ({counts})")
+        
+        if status == "Accepted":
+            print(f"✅ {test_name} PASSED ({usage})")
+            if "queries" in result:
+                solution_latency = result["solution_latency"]
+                print(f"   {result['queries']} queries, {result['round_trips']} round-trips, "
+                      f"solution latency {solution_latency['mean_ms']:.2f}ms avg / {solution_latency['max_ms']:.2f}ms max, "
+                      f"interactor {result['interactor_latency']['mean_ms']:.2f}ms avg")
+        elif status == "Wrong Answer":
+            print(f"❌ {test_name} WRONG ANSWER ({usage})")
+            print(f"Mismatch at {result['mismatch']}")
+            print(f"Expected:\n{result['expected']}")
+            print(f"Got:\n{result['actual']}")
+        elif status == "Runtime Error":
+            print(f"❌ Runtime Error in {test_name}")
+            print(f"Error: {result['error']}")
+        elif status == "Time Limit Exceeded":
+            print(f"⏰ {test_name} TIME LIMIT EXCEEDED ({usage}, limit {self.time_limit:.2f}s)")
+        elif status == "Memory Limit Exceeded":
+            print(f"🧠 {test_name} MEMORY LIMIT EXCEEDED ({usage}, limit {self.memory_limit} MB)")
+        elif status == "Skipped":
+            print(f"⏭️  {test_name} SKIPPED (fail-fast)")
+        elif status == "Output Generated":
+            print(f"🔍 {test_name} OUTPUT ({usage}):")
+            print(result["output"])
+        else:
+            print(f"💥 {test_name} ERROR: {result.get('error')}")
     
     def test_all_solutions(self):
-        """Test all available solutions"""
+        """Test all available solutions; returns the list of per-case results"""
         solutions = self.find_solution_files()
         
         if not solutions:
             print("❌ No solution files found!")
-            return
+            return self.results
         
         print(f"Found solutions: {list(solutions.keys())}")
         
-        # Test cases to run
-        test_cases = [
-            ("sample_input.txt", "sample_output.txt", "Sample Test"),
-            ("input.txt", "expected.txt", "Custom Test"),
-            ("input.txt", None, "Input Test")  # Just run with input, no expected output
-        ]
+        self.load_metadata()
+        self.load_history()
+        
+        if self.metadata.get("interactive"):
+            interactor = self.find_interactor()
+            if not interactor:
+                print("❌ Interactive problem but no interactor found (interactor.cpp / interactor.py)")
+                return self.results
+            try:
+                self.interactor_command = self.prepare_program(interactor, "interactor")
+            except Exception as e:
+                print(f"❌ {e}")
+                return self.results
+            print(f"🔁 Interactive problem, interactor: {interactor.name}")
+        
+        # Load test cases once and share them across languages
+        test_cases = self.load_test_cases()
+        if not test_cases:
+            print("⚠️  No test cases found (test_cases.json, sample_input.txt or input.txt)")
         
         for lang, solution_file in solutions.items():
             print(f"\n{'='*50}")
@@ -224,24 +854,35 @@ class SolutionTester:
             if lang == 'cpp':
                 executable = self.compile_cpp(solution_file)
                 if not executable:
+                    self.compile_errors.append(lang)
                     continue
             elif lang == 'java':
                 executable = self.compile_java(solution_file)
                 if not executable:
+                    self.compile_errors.append(lang)
                     continue
             
+            if lang == 'python' and not self.cold_start and not self.interactor_command:
+                self.fork_pools[executable] = ForkServerPool(
+                    executable, self.problem_dir, min(self.max_workers, max(len(test_cases), 1))
+                )
+            
             # Run test cases
-            for input_name, expected_name, test_name in test_cases:
-                input_file = self.problem_dir / input_name
-                expected_file = self.problem_dir / expected_name if expected_name else None
-                
-                self.run_test_case(executable, lang, input_file, expected_file, f"{test_name} ({lang})")
+            try:
+                for result in self.run_test_cases(executable, lang, test_cases):
+                    self.report_result(result)
+                    self.results.append(result)
+            finally:
+                fork_pool = self.fork_pools.pop(executable, None)
+                if fork_pool:
+                    fork_pool.close()
         
         # Print summary
         self.print_summary()
         
         # Save results
         self.save_results()
+        return self.results
     
     def print_summary(self):
         """Print test summary"""
@@ -254,7 +895,7 @@ class SolutionTester:
             return
         
         passed = sum(1 for r in self.results if r["status"] == "Accepted")
-        total = len([r for r in self.results if r["status"] in ["Accepted", "Wrong Answer", "Runtime Error", "Time Limit Exceeded"]])
+        total = len([r for r in self.results if r["status"] in ["Accepted", "Wrong Answer", "Runtime Error", "Time Limit Exceeded", "Memory Limit Exceeded"]])
         
         print(f"Tests passed: {passed}/{total}")
         
@@ -266,9 +907,14 @@ class SolutionTester:
         
         for status, count in status_count.items():
             emoji = {"Accepted": "✅", "Wrong Answer": "❌", "Runtime Error": "💥", 
-                    "Time Limit Exceeded": "⏰", "Output Generated": "🔍"}.get(status, "❓")
+                    "Time Limit Exceeded": "⏰", "Memory Limit Exceeded": "🧠", "Output Generated": "🔍",
+                    "Skipped": "⏭️"}.get(status, "❓")
             print(f"{emoji} {status}: {count}")
         
+        flaky = sum(1 for r in self.results if r.get("flaky"))
+        if flaky:
+            print(f"🎲 Flaky: {flaky}")
+        
         if passed == total and total > 0:
             print("\n🎉 All tests passed!")
         elif passed > 0:
@@ -289,10 +935,34 @@ class SolutionTester:
 def main():
     parser = argparse.ArgumentParser(description='Test competitive programming solutions')
     parser.add_argument('problem_path', help='Path to problem directory')
+    parser.add_argument('--no-compile-cache', action='store_true', help='Always invoke the compiler, bypassing the compile cache')
+    parser.add_argument('--no-pch', action='store_true', help='Do not use a precompiled <bits/stdc++.h>')
+    parser.add_argument('-j', '--jobs', type=int, help='Maximum test cases run in parallel (default: min(4, CPUs))')
+    parser.add_argument('--cold-start', action='store_true', help='Start a fresh python3 per Python test (judge-faithful timing)')
+    parser.add_argument('--fail-fast', action='store_true', help='Stop all remaining cases after the first failure')
+    parser.add_argument('--no-history', action='store_true', help='Run cases in file order instead of failed/slowest first')
+    parser.add_argument('--no-cache', action='store_true', help='Always execute, ignoring cached results of unchanged binaries on unchanged inputs')
+    parser.add_argument('--repeat', type=int, default=1, help='Run every case N times (interleaved) for timing statistics and flakiness checks')
+    parser.add_argument('--checker', choices=list(CHECKERS), help='Output comparison mode (default: metadata.json "checker" or token)')
+    parser.add_argument('--abs-eps', type=float, help='Absolute tolerance for the float checker')
+    parser.add_argument('--rel-eps', type=float, help='Relative tolerance for the float checker')
     
     args = parser.parse_args()
     
-    tester = SolutionTester(args.problem_path)
+    tester = SolutionTester(
+        args.problem_path,
+        use_compile_cache=not args.no_compile_cache,
+        use_pch=not args.no_pch,
+        max_workers=args.jobs,
+        cold_start=args.cold_start,
+        checker=args.checker,
+        abs_eps=args.abs_eps,
+        rel_eps=args.rel_eps,
+        fail_fast=args.fail_fast,
+        use_history=not args.no_history,
+        repeat=args.repeat,
+        use_run_cache=not args.no_cache
+    )
     tester.test_all_solutions()
 
 if __name__ == "__main__":